@@ -146,14 +146,15 @@ st.markdown("""
     <h4>1️⃣ Configure the Initial Simulation Parameters</h4>
     <ul>
         <li>Choose the number of aircraft alternatives to display at the end of the TOPSIS analysis</li>
-        <li>Choose the type of electrification (hybrid-electric or full electric) ❌</li>
-        <li>Choose the confidence in projecting technology assumptions ❌</li>
-        <li>Choose the timeframe desired ❌</li>
-        <li>Choose the aircraft size ❌</li>
-        <li>Choose the electric architecture ❌</li>
+        <li>Choose the type of electrification (hybrid-electric or full electric)</li>
+        <li>Choose the confidence in projecting technology assumptions</li>
+        <li>Choose the timeframe desired</li>
+        <li>Choose the aircraft size</li>
+        <li>Choose the electric architecture</li>
+        <li>Choose the random seed</li>
     </ul>
     <p style='color:#999; font-size:0.9rem;'>
-        The ❌ symbol refers to buttons present on the tool but not functional at the moment.
+        These parameters shift the simulated design space (notional trends) and, with the random seed, make a run reproducible.
     </p>
     <hr style='border:0.3px solid #333; margin:1rem 0;'>
     <h4>2️⃣ Set Criteria Weights</h4>
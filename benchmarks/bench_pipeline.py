@@ -0,0 +1,202 @@
+"""Benchmarks of the ranking pipeline, without Streamlit.
+
+Sweeps the number of alternatives, the number of criteria and the size of
+weight batches, and times each stage of the Tool page pipeline:
+generation, normalization, scoring (weighting + ideals + distances),
+top-N selection, full sort and batched scoring. Wall time is the best of
+``--repeat`` runs; peak memory is measured in a separate traced run with
+``tracemalloc`` so that tracing does not distort the timings.
+
+Results are written as JSON Lines, one record per (stage, n, criteria, K),
+with the git commit and library versions so that files from two commits
+can be compared::
+
+    python benchmarks/bench_pipeline.py --output before.jsonl
+    python benchmarks/bench_pipeline.py --output after.jsonl
+    python benchmarks/bench_pipeline.py --compare before.jsonl after.jsonl
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mcdm.batch import batch_topsis  # noqa: E402
+from mcdm.generator import generate_design_space  # noqa: E402
+from mcdm.ranking import Ranking  # noqa: E402
+from mcdm.topsis import closeness, ideal_points, score_normalized, vector_normalize  # noqa: E402
+
+DEFAULT_N = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_CRITERIA = [6, 12, 25, 50]
+DEFAULT_BATCH = [1, 16, 256]
+QUICK = {"n": [1_000, 10_000, 100_000], "criteria": [6, 25], "batch": [1, 16]}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat):
+    """Best wall time over ``repeat`` runs and traced peak memory of one run."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+def legacy_distance_loop(weighted, ideal, anti_ideal):
+    """The per-row Python loop the Tool page used before the vectorized engine."""
+    d_plus, d_minus = [], []
+    for i in range(weighted.shape[0]):
+        d_plus.append(np.sqrt(sum((weighted[i, c] - ideal[c]) ** 2 for c in range(weighted.shape[1]))))
+        d_minus.append(np.sqrt(sum((weighted[i, c] - anti_ideal[c]) ** 2 for c in range(weighted.shape[1]))))
+    return [m / (p + m) for p, m in zip(d_plus, d_minus)]
+
+
+def design_matrix(n, n_criteria, seed):
+    if n_criteria == 6:
+        return generate_design_space(n, seed)
+    return np.random.default_rng(seed).uniform(1.0, 10.0, size=(n, n_criteria))
+
+
+def bench_case(n, n_criteria, batches, repeat, seed, legacy_limit, top_n):
+    """Yield one record per stage for ``n`` alternatives and ``n_criteria`` criteria."""
+    rng = np.random.default_rng(seed)
+    benefit = np.zeros(n_criteria, dtype=bool)
+    benefit[0] = True
+    weights = rng.dirichlet(np.ones(n_criteria))
+    matrix = design_matrix(n, n_criteria, seed)
+    normalized, _ = vector_normalize(matrix)
+    scores = score_normalized(normalized, weights, benefit)
+
+    stages = {
+        "normalize": lambda: vector_normalize(matrix),
+        "score": lambda: score_normalized(normalized, weights, benefit),
+        "top_n": lambda: Ranking(scores, top_n=top_n),
+        "full_sort": lambda: Ranking(scores, top_n=top_n).order,
+    }
+    if n_criteria == 6:
+        stages = {"generate": lambda: generate_design_space(n, seed), **stages}
+    if n <= legacy_limit:
+        weighted = normalized * weights
+        ideal, anti_ideal = ideal_points(weighted, benefit)
+        stages["score_legacy_loop"] = lambda: legacy_distance_loop(weighted, ideal, anti_ideal)
+        stages["score_vectorized_distances"] = lambda: closeness(weighted, ideal, anti_ideal)
+
+    for stage, func in stages.items():
+        seconds, peak = measure(func, repeat)
+        yield record(stage, n, n_criteria, 1, seconds, peak)
+
+    for k in batches:
+        weight_matrix = rng.dirichlet(np.ones(n_criteria), size=k)
+        seconds, peak = measure(lambda: batch_topsis(normalized, weight_matrix, benefit, top_n=top_n, keep_scores=False), repeat)
+        yield record("batch_score", n, n_criteria, k, seconds, peak)
+
+
+def record(stage, n, n_criteria, k, seconds, peak):
+    return {
+        "stage": stage,
+        "n": n,
+        "criteria": n_criteria,
+        "weight_sets": k,
+        "seconds": seconds,
+        "alternatives_per_s": n * k / seconds if seconds > 0 else None,
+        "peak_bytes": peak,
+    }
+
+
+def run(args, out):
+    meta = {
+        "stage": "meta",
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+    }
+    out.write(json.dumps(meta) + "\n")
+    for n in args.n:
+        for n_criteria in args.criteria:
+            if n * n_criteria > args.max_elements:
+                print(f"skip n={n:,} criteria={n_criteria} (above --max-elements)", file=sys.stderr)
+                continue
+            for rec in bench_case(n, n_criteria, args.batch, args.repeat, args.seed, args.legacy_limit, args.top_n):
+                out.write(json.dumps(rec) + "\n")
+                out.flush()
+                print(f"{rec['stage']:>27} n={n:>10,} c={n_criteria:>3} K={rec['weight_sets']:>4} "
+                      f"{rec['seconds'] * 1e3:10.2f} ms  {rec['peak_bytes'] / 2**20:9.1f} MiB", file=sys.stderr)
+
+
+def load(path):
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return {(r["stage"], r["n"], r["criteria"], r["weight_sets"]): r for r in records if r["stage"] != "meta"}
+
+
+def compare(before_path, after_path, threshold):
+    """Print time and memory ratios (after / before); returns 1 if any stage regressed."""
+    before, after = load(before_path), load(after_path)
+    regressed = False
+    print(f"{'stage':>27} {'n':>10} {'c':>3} {'K':>4} {'time x':>8} {'mem x':>8}")
+    for key in sorted(before.keys() & after.keys(), key=lambda k: (k[1], k[2], k[0], k[3])):
+        time_ratio = after[key]["seconds"] / before[key]["seconds"]
+        mem_ratio = after[key]["peak_bytes"] / max(before[key]["peak_bytes"], 1)
+        flag = " <-- slower" if time_ratio > threshold else ""
+        regressed |= bool(flag)
+        print(f"{key[0]:>27} {key[1]:>10,} {key[2]:>3} {key[3]:>4} {time_ratio:8.2f} {mem_ratio:8.2f}{flag}")
+    return 1 if regressed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--n", type=int, nargs="+", default=DEFAULT_N, help="numbers of alternatives")
+    parser.add_argument("--criteria", type=int, nargs="+", default=DEFAULT_CRITERIA, help="numbers of criteria")
+    parser.add_argument("--batch", type=int, nargs="+", default=DEFAULT_BATCH, help="weight-batch sizes K")
+    parser.add_argument("--quick", action="store_true", help="small sweep for a fast check")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--legacy-limit", type=int, default=10_000, help="largest n for the legacy Python loop")
+    parser.add_argument("--max-elements", type=float, default=1e8, help="skip cases with n * criteria above this")
+    parser.add_argument("--output", help="JSON Lines file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=1.2, help="time ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+    if args.quick:
+        args.n, args.criteria, args.batch = QUICK["n"], QUICK["criteria"], QUICK["batch"]
+    if args.output:
+        with open(args.output, "w") as out:
+            run(args, out)
+    else:
+        run(args, sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""Multi-criteria decision making engine used by the Streamlit pages.
+
+Nothing in this package imports Streamlit, so it can be used from scripts,
+notebooks and batch jobs as well as from the dashboard.
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from mcdm.cli import main
+
+sys.exit(main())
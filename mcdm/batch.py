@@ -0,0 +1,92 @@
+"""TOPSIS under many weight vectors at once.
+
+The normalized matrix is shared by every weight set. Because weighting is a
+non-negative per-column scale, the weighted ideal of weight set ``k`` is
+``W[k] * best`` where ``best`` is the column max/min of the normalized
+matrix, so the squared distances reduce to one matrix product::
+
+    D+[i, k]^2 = sum_c (N[i, c] - best[c])^2 * W[k, c]^2
+
+Work is done in ``(row_block x weight_block)`` tiles, so the full ``K x n``
+score matrix never has to be held in memory unless it is asked for.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from mcdm.topsis import as_matrix
+
+
+@dataclass
+class BatchResult:
+    """Scores and per-weight-set top-N of a batched run."""
+
+    top_indices: np.ndarray  # (K, top_n) row numbers, best first
+    top_scores: np.ndarray   # (K, top_n)
+    scores: np.ndarray = None  # (K, n) when requested
+
+
+def _merge_top_n(best_scores, best_indices, scores, offset, top_n):
+    """Merge a ``(K, rows)`` score tile into the running ``(K, top_n)`` leaders."""
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    if scores.shape[1] > top_n:
+        part = np.argpartition(scores, -top_n, axis=1)[:, -top_n:]
+    else:
+        part = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    tile_scores = np.take_along_axis(scores, part, axis=1)
+    all_scores = np.concatenate([best_scores, tile_scores], axis=1)
+    all_indices = np.concatenate([best_indices, part + offset], axis=1)
+    keep = np.argsort(-all_scores, axis=1, kind="stable")[:, :top_n]
+    return np.take_along_axis(all_scores, keep, axis=1), np.take_along_axis(all_indices, keep, axis=1)
+
+
+def batch_topsis(normalized, weight_matrix, benefit, top_n=10, row_block=65_536,
+                 weight_block=64, keep_scores=True, out=None):
+    """Score ``normalized`` under every row of ``weight_matrix``.
+
+    ``normalized`` is the vector-normalized ``(n, criteria)`` matrix (see
+    :func:`mcdm.topsis.vector_normalize`) and ``weight_matrix`` is
+    ``(K, criteria)`` with non-negative entries. ``out`` may be a
+    preallocated ``(K, n)`` array, e.g. a ``.npy`` memmap, to receive the
+    scores; with ``keep_scores=False`` and no ``out`` only the top-N is kept.
+    """
+    normalized = as_matrix(normalized)
+    weight_matrix = np.atleast_2d(np.asarray(weight_matrix, dtype=np.float64))
+    benefit = np.asarray(benefit, dtype=bool)
+    n_rows, n_criteria = normalized.shape
+    n_sets = weight_matrix.shape[0]
+    if weight_matrix.shape[1] != n_criteria:
+        raise ValueError(f"weight matrix has {weight_matrix.shape[1]} criteria, expected {n_criteria}")
+    if (weight_matrix < 0).any():
+        raise ValueError("weights must be non-negative")
+    top_n = min(int(top_n), n_rows)
+
+    col_max = normalized.max(axis=0)
+    col_min = normalized.min(axis=0)
+    best = np.where(benefit, col_max, col_min)
+    worst = np.where(benefit, col_min, col_max)
+    squared_weights = weight_matrix ** 2
+
+    if out is None and keep_scores:
+        out = np.empty((n_sets, n_rows))
+
+    top_scores = np.empty((n_sets, top_n))
+    top_indices = np.empty((n_sets, top_n), dtype=np.int64)
+    for k0 in range(0, n_sets, weight_block):
+        w2 = squared_weights[k0:k0 + weight_block].T
+        block_scores = np.full((w2.shape[1], 0), -np.inf)
+        block_indices = np.zeros((w2.shape[1], 0), dtype=np.int64)
+        for r0 in range(0, n_rows, row_block):
+            rows = normalized[r0:r0 + row_block]
+            d_plus = np.sqrt(((rows - best) ** 2) @ w2)
+            d_minus = np.sqrt(((rows - worst) ** 2) @ w2)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                tile = (d_minus / (d_plus + d_minus)).T
+            if out is not None:
+                out[k0:k0 + tile.shape[0], r0:r0 + tile.shape[1]] = tile
+            block_scores, block_indices = _merge_top_n(block_scores, block_indices, tile, r0, top_n)
+        top_scores[k0:k0 + weight_block] = block_scores
+        top_indices[k0:k0 + weight_block] = block_indices
+
+    return BatchResult(top_indices=top_indices, top_scores=top_scores, scores=out)
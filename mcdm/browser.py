@@ -0,0 +1,116 @@
+"""Server-side paging, sorting and filtering of ranked results.
+
+Only the requested window of rows ever leaves this object, so the cost of
+showing a page does not depend on the size of the design space. Sort
+orders and filter results are cached, which makes flipping pages a slice.
+"""
+
+import numpy as np
+
+RANK_COLUMN = "Rank"
+SCORE_COLUMN = "TOPSIS Score"
+
+
+class ResultsBrowser:
+    """Pages over the ``selection`` of ``data`` (one row per alternative) ranked by ``ranking``.
+
+    ``selection`` holds the row numbers of ``data`` in the order of the ranking
+    scores (``None``: every row, in order), so a subset of a shared frame is
+    browsed without copying it. The score column is taken from the ranking.
+    Column sort orders depend only on the data, so the same browser is kept
+    while the ranking is refreshed (see :meth:`set_ranking`).
+    """
+
+    def __init__(self, data, ranking, score_column=SCORE_COLUMN, selection=None):
+        self.data = data
+        self.ranking = ranking
+        self.score_column = score_column
+        self.selection = selection
+        self._values = {}
+        self._column_orders = {}
+        self._bounds = {}
+        self._last_query = None
+        self._last_rows = None
+
+    def set_ranking(self, ranking):
+        if ranking is not self.ranking:
+            self.ranking = ranking
+            self._bounds.pop(self.score_column, None)
+            self._last_query = None
+
+    @property
+    def n_rows(self):
+        return len(self.data) if self.selection is None else len(self.selection)
+
+    def values(self, column):
+        if column == self.score_column:
+            return self.ranking.scores
+        if column not in self._values:
+            values = self.data[column].to_numpy()
+            self._values[column] = values if self.selection is None else values[self.selection]
+        return self._values[column]
+
+    def bounds(self, column):
+        """``(min, max)`` of a column, computed once."""
+        if column not in self._bounds:
+            values = self.values(column)
+            self._bounds[column] = (np.nanmin(values), np.nanmax(values))
+        return self._bounds[column]
+
+    def _sort_order(self, sort_by, ascending):
+        if sort_by in (RANK_COLUMN, self.score_column):
+            # Best first is rank ascending and score descending.
+            order = self.ranking.order
+            return order if ascending == (sort_by == RANK_COLUMN) else order[::-1]
+        if sort_by not in self._column_orders:
+            self._column_orders[sort_by] = np.argsort(self.values(sort_by), kind="stable")
+        order = self._column_orders[sort_by]
+        return order if ascending else order[::-1]
+
+    def _mask(self, filters):
+        mask = np.ones(self.n_rows, dtype=bool)
+        for column, (low, high) in filters.items():
+            values = self.values(column)
+            mask &= (values >= low) & (values <= high)
+        return mask
+
+    def active_filters(self, filters):
+        """Drop filters that span the whole column range."""
+        return {c: tuple(b) for c, b in (filters or {}).items() if tuple(b) != self.bounds(c)}
+
+    def rows(self, sort_by=RANK_COLUMN, ascending=True, filters=None):
+        """Row numbers matching ``filters`` in display order (cached)."""
+        filters = self.active_filters(filters)
+        query = (sort_by, ascending, tuple(sorted(filters.items())))
+        if query != self._last_query:
+            order = self._sort_order(sort_by, ascending)
+            self._last_rows = order[self._mask(filters)[order]] if filters else order
+            self._last_query = query
+        return self._last_rows
+
+    def total(self, sort_by=RANK_COLUMN, ascending=True, filters=None):
+        """Number of rows left after filtering."""
+        if not self.active_filters(filters):
+            return self.n_rows
+        return self.rows(sort_by, ascending, filters).shape[0]
+
+    def page(self, page=0, page_size=25, sort_by=RANK_COLUMN, ascending=True, filters=None):
+        """Return ``(window, total)`` for one page of results.
+
+        ``window`` carries ``Rank`` and score columns; ``total`` is the
+        number of rows left after filtering.
+        """
+        start = page * page_size
+        filters = self.active_filters(filters)
+        best_first = ascending == (sort_by == RANK_COLUMN)
+        if sort_by in (RANK_COLUMN, self.score_column) and best_first and not filters \
+                and start + page_size <= self.ranking.top_n:
+            # Leaders only: no need for the full order.
+            rows, total = self.ranking.top(start + page_size)[start:], self.n_rows
+        else:
+            all_rows = self.rows(sort_by, ascending, filters)
+            rows, total = all_rows[start:start + page_size], all_rows.shape[0]
+        window = self.data.iloc[rows if self.selection is None else self.selection[rows]].copy()
+        window.insert(0, RANK_COLUMN, [self.ranking.rank(row) for row in rows])
+        window[self.score_column] = self.ranking.scores[rows]
+        return window, total
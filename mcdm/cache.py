@@ -0,0 +1,185 @@
+"""In-process caches for the ranking pipeline.
+
+Streamlit reruns the page script on every widget interaction but keeps
+imported modules alive, so module-level caches survive reruns and are
+shared by all sessions of the server process. Two layers are used:
+
+* ``DATASETS``: the content hash of the design matrix, keyed by the scenario
+  inputs (the data itself is owned by the byte-budgeted result store,
+  :mod:`mcdm.store`);
+* ``NORMALIZED``: the vector-normalized matrix, keyed by the dataset hash.
+
+``PARETO`` keeps the non-dominated row numbers of each dataset,
+``SCORES`` the score vectors of recent weight sets, ``GRIDS`` the
+plotting grid cell of every row (see :mod:`mcdm.downsample`) and
+``BOUNDS`` the column ranges of the requirement sliders and ``INDEXES``
+the sorted column indexes that answer their queries (see :mod:`mcdm.filters`).
+
+Normalized matrices, Pareto fronts and scores are also written through to
+the on-disk cache (:mod:`mcdm.disk_cache`), so they survive a restart.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from mcdm.disk_cache import DISK
+from mcdm.downsample import grid_codes
+from mcdm.filters import ColumnIndex, column_bounds
+from mcdm.pareto import pareto_front
+from mcdm.store import STORE, Dataset
+from mcdm.topsis import vector_normalize
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping with hit/miss counters."""
+
+    def __init__(self, maxsize, name=""):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "cache": self.name,
+            "entries": len(self._data),
+            "max entries": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit rate": self.hits / total if total else 0.0,
+        }
+
+
+DATASETS = LRUCache(maxsize=64, name="dataset hash")
+NORMALIZED = LRUCache(maxsize=16, name="normalized matrix")
+PARETO = LRUCache(maxsize=16, name="pareto front")
+SCORES = LRUCache(maxsize=8, name="scores")
+GRIDS = LRUCache(maxsize=16, name="plot grid")
+BOUNDS = LRUCache(maxsize=16, name="column bounds")
+INDEXES = LRUCache(maxsize=4, name="column index")
+
+
+def array_hash(matrix):
+    """Content hash of an array (shape, dtype and bytes)."""
+    matrix = np.ascontiguousarray(matrix)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str((matrix.shape, matrix.dtype.str)).encode())
+    digest.update(memoryview(matrix).cast("B"))
+    return digest.hexdigest()
+
+
+def cached_dataset(scenario, generate):
+    """Return ``(data, matrix, data_hash)`` for a hashable scenario key.
+
+    ``generate()`` must return ``(data, matrix)``, where ``matrix`` is the
+    numeric decision matrix; the hash is computed once, on the miss. The
+    data is kept in :data:`mcdm.store.STORE` under that hash; once evicted
+    there it is generated again.
+    """
+    built = []
+
+    def build():
+        data, matrix = generate()
+        built.append(Dataset.from_frame(data, matrix))
+        return array_hash(matrix)
+
+    def stored():
+        if not built:
+            build()
+        return built[-1]
+
+    data_hash = DATASETS.get_or_compute(scenario, build)
+    dataset = STORE.dataset(data_hash, stored)
+    return dataset.frame, dataset.matrix, data_hash
+
+
+def cached_normalized(data_hash, matrix):
+    """Return ``(normalized, norms)`` for the dataset with hash ``data_hash``."""
+    def load():
+        arrays = DISK.get_or_compute(
+            ("normalized", data_hash),
+            lambda: dict(zip(("normalized", "norms"), vector_normalize(matrix))),
+        )
+        return arrays["normalized"], arrays["norms"]
+
+    return NORMALIZED.get_or_compute(data_hash, load)
+
+
+def cached_pareto_front(data_hash, matrix, benefit):
+    """Row numbers of the non-dominated alternatives of a dataset."""
+    key = (data_hash, tuple(bool(b) for b in benefit))
+    return PARETO.get_or_compute(
+        key, lambda: DISK.get_or_compute(("pareto front",) + key, lambda: {"rows": pareto_front(matrix, benefit)})["rows"],
+    )
+
+
+def cached_scores(data_hash, weights, score):
+    """Scores of a dataset under a weight vector; ``score()`` computes them on a miss."""
+    key = (data_hash, tuple(float(w) for w in weights))
+    return SCORES.get_or_compute(
+        key, lambda: DISK.get_or_compute(("scores",) + key, lambda: {"scores": score()})["scores"],
+    )
+
+
+def cached_grid_codes(data_hash, matrix, budget):
+    """Plotting grid cell of every row of a dataset, for a point budget."""
+    return GRIDS.get_or_compute((data_hash, budget), lambda: grid_codes(matrix, budget))
+
+
+def cached_column_bounds(data_hash, matrix):
+    """``(low, high)`` of every column of a dataset, for the requirement sliders."""
+    return BOUNDS.get_or_compute(data_hash, lambda: column_bounds(matrix))
+
+
+def cached_column_index(data_hash, matrix):
+    """Sorted column index of a dataset, for the requirement filters."""
+    return INDEXES.get_or_compute(data_hash, lambda: ColumnIndex(matrix))
+
+
+def cache_stats():
+    """Hit/miss counters of every layer, one dict per cache."""
+    return [DATASETS.stats(), NORMALIZED.stats(), PARETO.stats(), SCORES.stats(), GRIDS.stats(), BOUNDS.stats(), INDEXES.stats(), DISK.stats()]
@@ -0,0 +1,161 @@
+"""Headless batch runs of TOPSIS scenarios.
+
+Usage::
+
+    python -m mcdm scenarios.json --output-dir results --format parquet --workers 8
+
+The scenario file is JSON, either a list of scenarios or an object with
+optional ``defaults`` and a ``scenarios`` list. Every scenario accepts the
+Tool page inputs plus a few run options::
+
+    {
+        "name": "regional-2045",
+        "passengers": 50, "timeframe": "2045", "tech_orient": "Nominal",
+        "electrif": "Turboprop", "architecture": ["Parallel Hybrid"],
+        "n_alternatives": 100000, "seed": 1,
+        "weights": {"NOx Emission": 5, "Total Energy Required": 4},
+        "source": "simulated",
+        "top_n": 10, "pareto_only": false
+    }
+
+``weights`` are slider values (0-5, default 3) keyed by the short criterion
+names. ``source`` is ``"simulated"``, the path of a CSV/Parquet file or an
+object ``{"path": ..., "column_map": {criterion: column}}`` (see
+:mod:`mcdm.loader`); files are converted once to the columnar cache.
+``"surrogate"`` or ``{"surrogate": "Polynomial"|"RBF", "rounds": 2}``
+samples ``n_alternatives`` designs through a surrogate model (see
+:mod:`mcdm.surrogate`) and adds the design variables to the output.
+Every scenario writes its full ranking to ``<name>_ranked.<format>``; the
+top-N of all scenarios is collected in ``summary.<format>``.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mcdm.browser import RANK_COLUMN, SCORE_COLUMN
+from mcdm.loader import load_design_space
+from mcdm.pipeline import (SCENARIO_DEFAULTS, make_scenario, normalize_weights, rank_design_space,
+                           sample_surrogate_space, simulate_design_space)
+from mcdm.surrogate import DESIGN_VARIABLES
+
+RUN_OPTIONS = {"name", "weights", "source", "top_n", "pareto_only"}
+
+
+def load_scenarios(path):
+    """Read a scenario file into a list of dicts with defaults applied."""
+    with open(path) as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        defaults, scenarios = {}, spec
+    else:
+        defaults, scenarios = spec.get("defaults", {}), spec["scenarios"]
+
+    loaded = []
+    for i, entry in enumerate(scenarios):
+        entry = {**defaults, **entry}
+        entry.setdefault("name", f"scenario_{i + 1}")
+        loaded.append(entry)
+    names = [entry["name"] for entry in loaded]
+    if len(set(names)) != len(names):
+        raise ValueError("Scenario names must be unique")
+    return loaded
+
+
+def load_source(source, scenario, weights=None):
+    """``(df, matrix)`` for a scenario's data source."""
+    if source == "simulated":
+        return simulate_design_space(scenario)
+    if source == "surrogate" or (isinstance(source, dict) and "surrogate" in source):
+        options = source if isinstance(source, dict) else {}
+        df, matrix, designs = sample_surrogate_space(
+            scenario,
+            weights,
+            model=options.get("surrogate", "Polynomial"),
+            rounds=options.get("rounds", 0),
+            refine_fraction=options.get("refine_fraction", 0.5),
+        )
+        # The design variables of every alternative follow the criteria in the output
+        return df.assign(**dict(zip(DESIGN_VARIABLES, designs.T))), matrix
+    if isinstance(source, dict):
+        options = dict(source)
+        return load_design_space(options.pop("path"), **options)
+    return load_design_space(source)
+
+
+def write_frame(df, path, fmt):
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        # float32 columns (compact file sources) keep their shortest repr instead of float64 noise
+        df.assign(**_float32_columns(df, str)).to_csv(path, index=False)
+
+
+def _float32_columns(df, dtype):
+    """float32 columns of ``df`` converted through their decimal repr."""
+    return {c: df[c].to_numpy().astype(str).astype(dtype) for c in df.columns if df[c].dtype == np.float32}
+
+
+def run_scenario(entry, output_dir, fmt, top_n=None):
+    """Score one scenario, write its ranking and return its top-N summary."""
+    start = time.perf_counter()
+    scenario = make_scenario(**{k: v for k, v in entry.items() if k not in RUN_OPTIONS})
+    weights = normalize_weights(entry.get("weights", {}))
+    top_n = int(top_n or entry.get("top_n", 10))
+
+    df, matrix = load_source(entry.get("source", "simulated"), scenario, weights)
+    df, scores, ranking = rank_design_space(df, matrix, weights, top_n=top_n,
+                                            pareto_only=entry.get("pareto_only", False))
+
+    ranked = df.iloc[ranking.order].assign(**{SCORE_COLUMN: scores[ranking.order]})
+    ranked.insert(0, RANK_COLUMN, range(1, len(ranked) + 1))
+    write_frame(ranked, Path(output_dir) / f"{entry['name']}_ranked.{fmt}", fmt)
+
+    # float64 so that summaries of simulated and compact file sources concatenate cleanly
+    summary = ranked.head(top_n)
+    summary = summary.assign(**_float32_columns(summary, np.float64))
+    summary.insert(0, "Scenario", entry["name"])
+    return entry["name"], summary, len(df), time.perf_counter() - start
+
+
+def run_batch(entries, output_dir, fmt="csv", workers=None, top_n=None, log=print):
+    """Run scenarios in a process pool; returns the combined top-N summary."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_scenario, entry, output_dir, fmt, top_n): entry["name"] for entry in entries}
+        for future in as_completed(futures):
+            name, summary, n_rows, elapsed = future.result()
+            summaries[name] = summary
+            log(f"{name}: ranked {n_rows:,} alternatives in {elapsed:.2f} s")
+
+    summary = pd.concat([summaries[entry["name"]] for entry in entries], ignore_index=True)
+    write_frame(summary, output_dir / f"summary.{fmt}", fmt)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m mcdm", description="Run TOPSIS scenarios without the dashboard.")
+    parser.add_argument("scenarios", help="JSON scenario file")
+    parser.add_argument("-o", "--output-dir", default="results", help="directory for the ranked results (default: results)")
+    parser.add_argument("-f", "--format", choices=["csv", "parquet"], default="csv", help="output format (default: csv)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--top-n", type=int, default=None, help="override top_n for every scenario")
+    args = parser.parse_args(argv)
+
+    entries = load_scenarios(args.scenarios)
+    print(f"Running {len(entries)} scenario(s); defaults: {SCENARIO_DEFAULTS}")
+    summary = run_batch(entries, args.output_dir, args.format, args.workers, args.top_n)
+    print(f"Wrote {len(summary)} summary rows to {Path(args.output_dir) / f'summary.{args.format}'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
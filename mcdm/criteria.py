@@ -0,0 +1,33 @@
+"""Criteria shared by the pages and the engine.
+
+``INPUTS_WITH_UNITS`` are the decision-matrix column names, ``INPUTS`` the
+short names used for the weight sliders, in the same order.
+"""
+
+INPUTS_WITH_UNITS = [
+    "Aircraft Cruise Speed (knots)",
+    "Total Energy Required (MJ)",
+    "Direct operating cost plus interest ($/mile)",
+    "Required yield per revenue passenger mile ($/mile)",
+    "Acquisition price with spares ($M)",
+    "NOx Emission (g/kg of fuel)"
+]
+
+INPUTS = [
+    "Aircraft Cruise Speed",
+    "Total Energy Required",
+    "Direct operating cost plus interest",
+    "Required yield per revenue passenger mile",
+    "Acquisition price with spares",
+    "NOx Emission"
+]
+
+# --- OPTIMIZATION TYPE (MAX/MIN) ---
+OPTIMIZATION = {
+    INPUTS_WITH_UNITS[0]: "max",
+    INPUTS_WITH_UNITS[1]: "min",
+    INPUTS_WITH_UNITS[2]: "min",
+    INPUTS_WITH_UNITS[3]: "min",
+    INPUTS_WITH_UNITS[4]: "min",
+    INPUTS_WITH_UNITS[5]: "min"
+}
@@ -0,0 +1,195 @@
+"""Persistent, content-addressed cache of pipeline arrays.
+
+The in-process caches of :mod:`mcdm.cache` are lost on every server restart.
+This layer keeps their expensive entries (generated design spaces, Pareto
+fronts, normalized matrices and score vectors) in
+``.cache/results/<digest>/``, one ``.npy`` file per array plus a
+``meta.json``. The digest hashes the key (scenario, weights, dataset hash...)
+with ``FORMAT_VERSION``, so identical requests find the same entry and a
+format change simply misses. Arrays are memory-mapped on load.
+
+``meta.json`` records the version, and the dtype and shape of every array;
+an entry that does not match is treated as a miss and removed. The cache
+is capped at ``max_bytes``: when a write takes the total over it, the least
+recently used entries (by the modification time of ``meta.json``, touched
+on every hit) are deleted until the total fits.
+
+The total size and the LRU order are kept in memory, built by one scan of
+the directory on first use, so reads and writes do no directory I/O. The
+directory is only scanned again when the budget is exceeded, which also
+picks up entries written by other processes.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+CACHE_DIR = Path(".cache") / "results"
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 4 * 2**30
+
+
+def key_digest(key):
+    """Hex digest of a key made of str/int/float/bool/None and tuples of them."""
+    return hashlib.blake2b(repr((FORMAT_VERSION, key)).encode(), digest_size=16).hexdigest()
+
+
+class DiskCache:
+    """Dicts of named arrays on disk, keyed by content, with a size cap."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, name="disk cache"):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index = None  # entry name -> nbytes, least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return self.directory / key_digest(key)
+
+    def load(self, key):
+        """The arrays stored under ``key`` (memory-mapped), or ``None``."""
+        entry = self.path(key)
+        try:
+            meta = json.loads((entry / "meta.json").read_text())
+            if meta["version"] != FORMAT_VERSION:
+                raise ValueError("format version")
+            arrays = {}
+            for name, spec in meta["arrays"].items():
+                array = np.load(entry / f"{name}.npy", mmap_mode="r")
+                if array.dtype.str != spec["dtype"] or list(array.shape) != spec["shape"]:
+                    raise ValueError(f"{name}.npy does not match meta.json")
+                arrays[name] = array
+            os.utime(entry / "meta.json")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, KeyError):
+            # Stale or partial entry: drop it and recompute
+            shutil.rmtree(entry, ignore_errors=True)
+            self._forget(entry.name)
+            self.misses += 1
+            return None
+        self._touch(entry.name, meta.get("nbytes", 0))
+        self.hits += 1
+        return arrays
+
+    def save(self, key, arrays):
+        """Write ``arrays`` (name -> ndarray) under ``key``, then enforce the size cap."""
+        entry = self.path(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.directory, prefix=".tmp-"))
+        try:
+            specs = {}
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                np.save(staging / f"{name}.npy", array)
+                specs[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+            meta = {
+                "version": FORMAT_VERSION,
+                "key": repr(key)[:500],
+                "created": time.time(),
+                "nbytes": sum((staging / f"{name}.npy").stat().st_size for name in arrays),
+                "arrays": specs,
+            }
+            (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                # Another thread or process wrote the same entry first.
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self._touch(entry.name, meta["nbytes"])
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def get_or_compute(self, key, compute):
+        """Stored arrays for ``key``; on a miss ``compute()`` returns them and they are written."""
+        arrays = self.load(key)
+        if arrays is None:
+            arrays = compute()
+            self.save(key, arrays)
+        return arrays
+
+    def entries(self):
+        """``(path, nbytes, last access)`` of every complete entry."""
+        if not self.directory.is_dir():
+            return []
+        entries = []
+        for entry in self.directory.iterdir():
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                meta_path = entry / "meta.json"
+                nbytes = json.loads(meta_path.read_text())["nbytes"]
+                entries.append((entry, nbytes, meta_path.stat().st_mtime))
+            except (OSError, ValueError, KeyError):
+                continue
+        return entries
+
+    def _scan(self):
+        """Rebuild the in-memory index from the directory; the caller holds the lock."""
+        entries = sorted(self.entries(), key=lambda item: item[2])
+        self._index = OrderedDict((entry.name, nbytes) for entry, nbytes, _ in entries)
+        self._total = sum(self._index.values())
+
+    def _touch(self, name, nbytes):
+        with self._lock:
+            if self._index is None:
+                self._scan()
+            self._total += nbytes - self._index.pop(name, 0)
+            self._index[name] = nbytes
+
+    def _forget(self, name):
+        with self._lock:
+            if self._index is not None:
+                self._total -= self._index.pop(name, 0)
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        with self._lock:
+            self._scan()
+            while self._total > self.max_bytes and self._index:
+                name, nbytes = self._index.popitem(last=False)
+                shutil.rmtree(self.directory / name, ignore_errors=True)
+                self._total -= nbytes
+                self.evictions += 1
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        with self._lock:
+            self._index, self._total = None, 0
+
+    def stats(self):
+        with self._lock:
+            if self._index is None:
+                self._scan()
+            n_entries, nbytes = len(self._index), self._total
+        total = self.hits + self.misses
+        return {
+            "cache": self.name,
+            "entries": n_entries,
+            "MiB": nbytes / 2**20,
+            "budget MiB": self.max_bytes / 2**20,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit rate": self.hits / total if total else 0.0,
+        }
+
+
+DISK = DiskCache()
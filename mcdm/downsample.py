@@ -0,0 +1,124 @@
+"""Server-side downsampling of a design space for plotting.
+
+The criteria are scaled to [0, 1] and cut into a regular grid with the same
+number of bins on every axis. Each occupied cell is drawn as one point: its
+best-scoring alternative. The number of bins is the largest one that keeps
+the number of occupied cells within the point budget. The leaders (top-N
+rows) are always kept, so the plotted payload stays bounded whatever the
+size of the design space and the best alternatives are never binned away.
+"""
+
+import numpy as np
+
+from mcdm.topsis import as_matrix
+
+DEFAULT_POINT_BUDGET = 5000
+MAX_BINS = 256
+
+
+def unit_scale(matrix):
+    """Columns of ``matrix`` scaled to [0, 1] (constant columns become 0)."""
+    low = matrix.min(axis=0)
+    span = matrix.max(axis=0) - low
+    span[span == 0] = 1.0
+    return (matrix - low) / span
+
+
+def cell_codes(unit, bins):
+    """Integer id of the grid cell of every row of a unit-scaled matrix."""
+    codes = np.zeros(unit.shape[0], dtype=np.int64)
+    for j in range(unit.shape[1]):
+        cell = (unit[:, j] * bins).astype(np.int64)
+        np.minimum(cell, bins - 1, out=cell)
+        codes *= bins
+        codes += cell
+    return codes
+
+
+def occupied_cells(codes):
+    """Number of distinct cell ids (a sort is much cheaper than ``np.unique`` here)."""
+    codes = np.sort(codes)
+    return 1 + np.count_nonzero(codes[1:] != codes[:-1]) if len(codes) else 0
+
+
+def _bins_within_budget(unit, budget):
+    """Largest bin count whose occupied cells fit in ``budget``.
+
+    ``budget ** (1 / n_criteria)`` bins always fit; the search doubles from
+    there and then bisects, so only a few grids are evaluated.
+    """
+    def fits(bins):
+        return occupied_cells(cell_codes(unit, bins)) <= budget
+
+    low = max(int(budget ** (1 / unit.shape[1])), 1)
+    high = None
+    while high is None and low < MAX_BINS:
+        step = min(2 * low, MAX_BINS)
+        if fits(step):
+            low = step
+        else:
+            high = step - 1
+    if high is None:
+        return low
+    while low < high:
+        mid = (low + high + 1) // 2
+        if fits(mid):
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def best_per_cell(codes, scores):
+    """Best-scoring row of every occupied cell and the size of the cell.
+
+    One sort of the cell ids; the best row of a cell is found with a
+    ``maximum.reduceat`` instead of a second sort key.
+    """
+    scores = np.where(np.isnan(scores), -np.inf, scores)
+    order = np.argsort(codes)
+    sorted_codes = codes[order]
+    first = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    counts = np.diff(np.r_[first, len(codes)])
+
+    sorted_scores = scores[order]
+    best = np.maximum.reduceat(sorted_scores, first)
+    candidates = np.flatnonzero(sorted_scores == np.repeat(best, counts))
+    cell = np.searchsorted(first, candidates, side="right") - 1
+    winners = candidates[np.r_[True, cell[1:] != cell[:-1]]]
+    return order[winners], counts
+
+
+def grid_codes(matrix, budget):
+    """Cell id of every row on the finest grid with at most ``budget`` occupied cells."""
+    matrix = as_matrix(matrix)
+    if matrix.shape[1] * np.log2(MAX_BINS) > 63:
+        raise ValueError("Too many criteria for 64-bit cell codes")
+    unit = unit_scale(matrix)
+    return cell_codes(unit, _bins_within_budget(unit, max(budget, 1)))
+
+
+def downsample(matrix, scores, budget=DEFAULT_POINT_BUDGET, keep=(), codes=None):
+    """Rows to plot and the number of alternatives each one stands for.
+
+    Returns ``(rows, counts)``; ``rows`` includes every row of ``keep``.
+    Extra rows from ``keep`` that are not the representative of their cell
+    count for themselves only. Below the budget every row is returned.
+    ``codes`` (from :func:`grid_codes`) only depend on the matrix and can be
+    reused when the scores change.
+    """
+    n = len(scores)
+    keep = np.asarray(keep, dtype=np.int64)
+    if n <= budget:
+        return np.arange(n), np.ones(n, dtype=np.int64)
+
+    if codes is None:
+        codes = grid_codes(matrix, budget - len(keep))
+    rows, counts = best_per_cell(codes, scores)
+
+    extra = np.setdiff1d(keep, rows)
+    # Extra rows leave the count of their cell (rows come in cell-code order)
+    np.subtract.at(counts, np.searchsorted(codes[rows], codes[extra]), 1)
+    rows = np.concatenate([rows, extra])
+    counts = np.concatenate([counts, np.ones(len(extra), dtype=np.int64)])
+    return rows, counts
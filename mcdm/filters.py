@@ -0,0 +1,95 @@
+"""Requirement filters on the criteria columns, answered from sorted indexes.
+
+A requirement is a closed range on one criterion (``cruise speed >= 230``
+is ``(230, None)``). Testing every row against every range costs a full
+pass over the matrix per query, which makes the sliders lag on millions of
+rows. :class:`ColumnIndex` is built once per dataset, when the first
+requirement is set (the slider ranges only need :func:`column_bounds`), and
+keeps, for every column:
+
+* the sorted values and the row order that sorts them;
+* the position of every row in that order (the inverse permutation).
+
+A range then maps to a slice of positions by binary search. The surviving
+rows are the intersection of those slices: the rows of the narrowest slice
+are probed against the position bounds of the other constraints, so a query
+touches ``O(log n + matches)`` elements instead of ``O(n * criteria)``.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from mcdm.topsis import as_matrix
+
+
+@dataclass
+class FilterResult:
+    """Rows meeting every requirement, and what the query cost."""
+
+    rows: np.ndarray    # ascending row numbers
+    matches: dict       # column -> rows meeting that requirement alone
+    seconds: float
+
+
+def column_bounds(matrix):
+    """``(low, high)`` of every column, ignoring NaN (the slider ranges, without an index)."""
+    matrix = as_matrix(matrix)
+    if not len(matrix):
+        return np.full(matrix.shape[1], np.nan), np.full(matrix.shape[1], np.nan)
+    with np.errstate(invalid="ignore"):
+        return np.nanmin(matrix, axis=0), np.nanmax(matrix, axis=0)
+
+
+class ColumnIndex:
+    """Sorted values, sort order and inverse order of every column of a matrix."""
+
+    def __init__(self, matrix):
+        matrix = as_matrix(matrix)
+        self.n_rows, n_columns = matrix.shape
+        dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self.order = np.empty((n_columns, self.n_rows), dtype=dtype)
+        self.values = np.empty((n_columns, self.n_rows))
+        self.positions = np.empty_like(self.order)
+        positions = np.arange(self.n_rows, dtype=dtype)
+        for j in range(n_columns):
+            # NaN sorts last, so it never falls inside a finite range. The
+            # order of ties does not matter: query results are sorted by row.
+            column = np.ascontiguousarray(matrix[:, j])
+            self.order[j] = np.argsort(column)
+            self.values[j] = column[self.order[j]]
+            self.positions[j, self.order[j]] = positions
+        self.low, self.high = column_bounds(matrix)
+
+    @property
+    def nbytes(self):
+        return self.order.nbytes + self.values.nbytes + self.positions.nbytes
+
+    def span(self, column, low=None, high=None):
+        """``(start, stop)`` positions of the values of ``column`` within ``[low, high]``."""
+        values = self.values[column]
+        start = 0 if low is None else int(np.searchsorted(values, low, side="left"))
+        stop = int(np.searchsorted(values, np.inf, side="right")) if high is None \
+            else int(np.searchsorted(values, high, side="right"))
+        return start, max(start, stop)
+
+    def query(self, requirements):
+        """:class:`FilterResult` of ``{column: (low, high)}``; ``None`` leaves a side open."""
+        started = time.perf_counter()
+        spans = {column: self.span(column, *bounds) for column, bounds in requirements.items()}
+        if not spans:
+            rows = np.arange(self.n_rows)
+        else:
+            # Start from the most selective requirement and probe the others
+            first = min(spans, key=lambda column: spans[column][1] - spans[column][0])
+            start, stop = spans[first]
+            rows = self.order[first, start:stop]
+            for column, (start, stop) in spans.items():
+                if column == first or rows.size == 0:
+                    continue
+                positions = self.positions[column, rows]
+                rows = rows[(positions >= start) & (positions < stop)]
+            rows = np.sort(rows).astype(np.intp)
+        matches = {column: stop - start for column, (start, stop) in spans.items()}
+        return FilterResult(rows, matches, time.perf_counter() - started)
@@ -0,0 +1,134 @@
+"""Seeded, vectorized design-space sampler.
+
+Stands in for the sizing-code outputs until real data is loaded. Every
+criterion is drawn uniformly between the baseline bounds below, after the
+bounds have been shifted and stretched by the scenario inputs of the Tool
+page (aircraft size, time frame, technology confidence, propulsion type and
+electric architecture). The factor tables are notional trends, not fitted
+values.
+
+Sampling is split in two steps so that scenarios sharing a seed can share
+the expensive random draws:
+
+* :func:`base_draws` - the ``(n, criteria)`` uniform block for a seed;
+* :func:`apply_scenario` - the affine map of those draws to criteria values.
+"""
+
+import numpy as np
+import pandas as pd
+
+from mcdm.criteria import INPUTS_WITH_UNITS
+
+# Baseline bounds, in INPUTS_WITH_UNITS order.
+BASE_LOW = np.array([210, 3, 6.4, 1.35, 220, 27032], dtype=np.float64)
+BASE_HIGH = np.array([250, 7, 8.7, 1.5, 270, 31032], dtype=np.float64)
+# Integer-valued criteria (cruise speed, NOx); the others keep 3 decimals.
+INTEGER_CRITERIA = np.array([True, False, False, False, False, True])
+DECIMALS = 3
+
+REFERENCE_PASSENGERS = 50
+# Exponent of (passengers / REFERENCE_PASSENGERS) applied to each criterion.
+SIZE_EXPONENTS = np.array([0.05, 0.8, 0.5, -0.2, 0.6, 0.0])
+
+# Multiplicative shifts of the bounds, per criterion.
+TIMEFRAME_FACTORS = {
+    "2035": np.array([1.00, 1.00, 1.00, 1.00, 1.00, 1.00]),
+    "2045": np.array([1.02, 0.90, 0.96, 0.97, 1.03, 0.85]),
+    "2055": np.array([1.04, 0.80, 0.92, 0.94, 1.06, 0.70]),
+}
+PROPULSION_FACTORS = {
+    "Turboprop": np.array([1.00, 1.00, 1.00, 1.00, 1.00, 1.00]),
+    "Turbofan": np.array([1.18, 1.10, 1.04, 1.02, 1.08, 1.05]),
+}
+ARCHITECTURE_FACTORS = {
+    "Hybrid": np.array([1.00, 0.95, 1.01, 1.00, 1.04, 0.85]),
+    "Series Hybrid": np.array([0.97, 0.93, 1.03, 1.01, 1.07, 0.80]),
+    "Parallel Hybrid": np.array([0.99, 0.94, 1.02, 1.00, 1.05, 0.82]),
+    "Full Electric": np.array([0.90, 0.75, 1.06, 1.04, 1.15, 0.05]),
+    "Turboelectric": np.array([1.00, 0.97, 1.02, 1.01, 1.06, 0.90]),
+}
+# Technology confidence: (location factors, spread factor).
+TECH_FACTORS = {
+    "Conservative": (np.array([0.99, 1.05, 1.03, 1.02, 1.03, 1.05]), 0.8),
+    "Nominal": (np.array([1.00, 1.00, 1.00, 1.00, 1.00, 1.00]), 1.0),
+    "Aggressive": (np.array([1.01, 0.92, 0.96, 0.98, 0.97, 0.90]), 1.3),
+}
+
+
+def base_draws(n_alternatives, seed):
+    """Uniform ``[0, 1)`` draws shared by every scenario with this seed.
+
+    The extra last column picks the electric architecture of each row when
+    several architectures are selected.
+    """
+    rng = np.random.default_rng(seed)
+    return rng.random((n_alternatives, len(INPUTS_WITH_UNITS) + 1))
+
+
+def scenario_bounds(passengers=REFERENCE_PASSENGERS, timeframe="2035", tech_orient="Nominal",
+                    electrif="Turboprop", architecture=None):
+    """Low/high bounds of every criterion for one scenario.
+
+    With an ``architecture`` name the bounds of that architecture are
+    returned; otherwise the conventional (no electric architecture) ones.
+    """
+    location, spread = TECH_FACTORS[tech_orient]
+    factor = (
+        (passengers / REFERENCE_PASSENGERS) ** SIZE_EXPONENTS
+        * TIMEFRAME_FACTORS[str(timeframe)]
+        * PROPULSION_FACTORS[electrif]
+        * location
+    )
+    if architecture is not None:
+        factor = factor * ARCHITECTURE_FACTORS[architecture]
+    center = (BASE_LOW + BASE_HIGH) / 2 * factor
+    half_width = (BASE_HIGH - BASE_LOW) / 2 * factor * spread
+    return center - half_width, center + half_width
+
+
+def apply_scenario(draws, passengers=REFERENCE_PASSENGERS, timeframe="2035", tech_orient="Nominal",
+                   electrif="Turboprop", architecture=()):
+    """Map :func:`base_draws` output to an ``(n, criteria)`` decision matrix."""
+    architecture = list(architecture)
+    if architecture:
+        bounds = [scenario_bounds(passengers, timeframe, tech_orient, electrif, arch) for arch in architecture]
+        low = np.stack([low for low, _ in bounds])
+        high = np.stack([high for _, high in bounds])
+        choice = np.minimum((draws[:, -1] * len(architecture)).astype(np.intp), len(architecture) - 1)
+    else:
+        low, high = (bound[np.newaxis] for bound in scenario_bounds(passengers, timeframe, tech_orient, electrif))
+        choice = None
+
+    # Everything is scaled so that a single rint() does the rounding: integer
+    # criteria use a unit scale and a -0.5 offset, which makes every integer
+    # in [low, high] equally likely; the others are rounded to DECIMALS.
+    scale = np.where(INTEGER_CRITERIA, 1.0, 10.0 ** DECIMALS)
+    start = np.where(INTEGER_CRITERIA, np.ceil(low) - 0.5, low) * scale
+    width = np.where(INTEGER_CRITERIA, np.floor(high) - np.ceil(low) + 1, high - low) * scale
+    if choice is None:
+        matrix = draws[:, :-1] * width[0]
+        matrix += start[0]
+    else:
+        matrix = draws[:, :-1] * width[choice]
+        matrix += start[choice]
+    np.rint(matrix, out=matrix)
+    matrix /= scale
+    return matrix
+
+
+def generate_design_space(n_alternatives, seed, **scenario):
+    """Draw a full ``(n, criteria)`` decision matrix in one vectorized call."""
+    return apply_scenario(base_draws(n_alternatives, seed), **scenario)
+
+
+def case_labels(n_alternatives):
+    """``Aircraft 1`` ... ``Aircraft n`` labels used by the pages."""
+    return [f"Aircraft {i+1}" for i in range(n_alternatives)]
+
+
+def design_frame(matrix, labels=None):
+    """Wrap a generated matrix in the ``Case`` + criteria DataFrame the pages expect."""
+    df = pd.DataFrame(matrix, columns=INPUTS_WITH_UNITS)
+    df = df.astype({c: "int64" for c, is_integer in zip(INPUTS_WITH_UNITS, INTEGER_CRITERIA) if is_integer})
+    df.insert(0, "Case", case_labels(matrix.shape[0]) if labels is None else labels)
+    return df
@@ -0,0 +1,167 @@
+"""Incremental TOPSIS over a design space that grows in batches.
+
+Sizing runs deliver design points in batches; scoring the whole set from
+scratch after each one renormalizes every column, searches the ideals again
+and recomputes every distance. :class:`IncrementalTopsis` keeps, as the
+streaming pass does (:mod:`mcdm.streaming`), the column sums of squares and
+raw minima/maxima, which give the norms and the ideal/anti-ideal points,
+plus per-row terms: the squared raw deviations ``E+`` and ``E-`` of every
+value from the ideal and anti-ideal of its column. With ``s = (w / norm)^2``
+the squared distances are just ``E+ @ s`` and ``E- @ s``.
+
+An appended batch always grows the norms, and unless every column grows by
+the same factor that changes the exact scores of every row, not only of the
+new ones. Three cases follow:
+
+* the batch stays within the current extremes: only the new rows get
+  terms, and the old rows are re-scored by two matrix-vector products over
+  the cached terms (no normalization, no search for the ideals);
+* the batch moves an ideal or anti-ideal value: the terms of the affected
+  columns are recomputed for every row first (a full re-score, counted in
+  ``full_rescores``);
+* with a ``norm_tolerance``, while every norm stays within that relative
+  distance of the norms the old scores were computed with, the old scores
+  are kept and only the new rows are scored. This trades exactness for a
+  cost proportional to the batch.
+
+The top-N is a bounded heap (see :func:`mcdm.streaming.push_top_n`): new rows
+are pushed into it, and it is rebuilt after the old scores are refreshed.
+"""
+
+import numpy as np
+
+from mcdm.ranking import Ranking
+from mcdm.streaming import push_top_n
+from mcdm.topsis import as_matrix
+
+
+class IncrementalTopsis:
+    """TOPSIS scores and top-N of a growing decision matrix."""
+
+    def __init__(self, weights, benefit, top_n=10, norm_tolerance=0.0, capacity=1024):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.benefit = np.asarray(benefit, dtype=bool)
+        self.top_n = int(top_n)
+        self.norm_tolerance = norm_tolerance
+        n_criteria = self.weights.shape[0]
+        self.n_rows = 0
+        self._values = np.empty((capacity, n_criteria))
+        self._plus = np.empty_like(self._values)
+        self._minus = np.empty_like(self._values)
+        self._scores = np.empty(capacity)
+        self.sumsq = np.zeros(n_criteria)
+        self.col_min = np.full(n_criteria, np.inf)
+        self.col_max = np.full(n_criteria, -np.inf)
+        self._scored_norms = None
+        self._heap = []
+        self.batches = 0
+        self.new_row_updates = 0
+        self.refreshes = 0
+        self.full_rescores = 0
+        self.columns_recomputed = 0
+
+    @property
+    def values(self):
+        return self._values[:self.n_rows]
+
+    @property
+    def scores(self):
+        return self._scores[:self.n_rows]
+
+    @property
+    def norms(self):
+        return np.sqrt(self.sumsq)
+
+    @property
+    def ideal(self):
+        """Raw ideal and anti-ideal values (weighting does not move them)."""
+        return np.where(self.benefit, self.col_max, self.col_min), np.where(self.benefit, self.col_min, self.col_max)
+
+    def _grow(self, n_rows):
+        capacity = self._values.shape[0]
+        if n_rows <= capacity:
+            return
+        capacity = max(n_rows, 2 * capacity)
+        for name in ("_values", "_plus", "_minus", "_scores"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:])
+            new[:self.n_rows] = old[:self.n_rows]
+            setattr(self, name, new)
+
+    def _scale(self, norms):
+        return (self.weights / np.where(norms != 0, norms, 1.0)) ** 2
+
+    def _score(self, rows, scale):
+        """TOPSIS scores of ``rows`` (a slice) from the cached terms."""
+        d_plus = np.sqrt(self._plus[rows] @ scale)
+        d_minus = np.sqrt(self._minus[rows] @ scale)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return d_minus / (d_plus + d_minus)
+
+    def append(self, block):
+        """Add a ``(rows, criteria)`` batch; returns ``"new rows"``, ``"refresh"`` or ``"full"``."""
+        block = as_matrix(block)
+        if block.shape[0] == 0:
+            return "new rows"
+        start, stop = self.n_rows, self.n_rows + block.shape[0]
+        self._grow(stop)
+        self._values[start:stop] = block
+
+        old_ideal, old_anti_ideal = self.ideal
+        self.sumsq += np.einsum("ij,ij->j", block, block)
+        np.minimum(self.col_min, block.min(axis=0), out=self.col_min)
+        np.maximum(self.col_max, block.max(axis=0), out=self.col_max)
+        ideal, anti_ideal = self.ideal
+        self.n_rows = stop
+        self.batches += 1
+
+        # Terms of the old rows only change on the columns whose ideals moved
+        moved = False
+        if start:
+            for terms, old, new in ((self._plus, old_ideal, ideal), (self._minus, old_anti_ideal, anti_ideal)):
+                for j in np.flatnonzero(old != new):
+                    np.subtract(self._values[:start, j], new[j], out=terms[:start, j])
+                    terms[:start, j] **= 2
+                    self.columns_recomputed += 1
+                    moved = True
+        np.subtract(block, ideal, out=self._plus[start:stop])
+        self._plus[start:stop] **= 2
+        np.subtract(block, anti_ideal, out=self._minus[start:stop])
+        self._minus[start:stop] **= 2
+
+        norms = self.norms
+        if start and not moved and self.norm_tolerance > 0 and \
+                np.all(np.abs(norms - self._scored_norms) <= self.norm_tolerance * self._scored_norms):
+            self._scores[start:stop] = self._score(slice(start, stop), self._scale(norms))
+            push_top_n(self._heap, self._scores[start:stop], start, self.top_n)
+            self.new_row_updates += 1
+            return "new rows"
+
+        self._scores[:stop] = self._score(slice(0, stop), self._scale(norms))
+        self._scored_norms = norms
+        self._heap = []
+        push_top_n(self._heap, self._scores[:stop], 0, self.top_n)
+        if moved:
+            self.full_rescores += 1
+            return "full"
+        self.refreshes += 1
+        return "refresh"
+
+    def top(self):
+        """``(rows, scores)`` of the top-N, best first."""
+        best = sorted(self._heap, reverse=True)
+        return np.array([row for _, row in best], dtype=np.int64), np.array([score for score, _ in best])
+
+    def ranking(self, labels=None):
+        """:class:`mcdm.ranking.Ranking` of the current scores."""
+        return Ranking(self.scores.copy(), labels=labels, top_n=self.top_n)
+
+    def stats(self):
+        return {
+            "rows": self.n_rows,
+            "batches": self.batches,
+            "new-row updates": self.new_row_updates,
+            "refreshes": self.refreshes,
+            "full re-scores": self.full_rescores,
+            "columns recomputed": self.columns_recomputed,
+        }
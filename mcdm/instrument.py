@@ -0,0 +1,106 @@
+"""Per-stage wall time and memory instrumentation.
+
+``Profiler.stage(name)`` is a context manager that records how long the
+block took and how much memory it allocated (through ``tracemalloc``).
+A disabled profiler hands out one shared no-op context manager, so the
+instrumented code costs a method call per stage when diagnostics are off.
+
+Tracing is process-wide while profilers are per session, so it is
+reference counted: the first tracing profiler starts ``tracemalloc`` and
+the last one to finish (or be garbage collected) stops it. Tracing started
+outside this module is left alone.
+"""
+
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import nullcontext
+from datetime import datetime
+
+_NO_OP = nullcontext()
+
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _acquire_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+
+def _release_tracing():
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+class _Stage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        if self.profiler.trace_memory:
+            self._start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        net = peak = None
+        if self.profiler.trace_memory:
+            current, peak_total = tracemalloc.get_traced_memory()
+            net = current - self._start_memory
+            peak = peak_total - self._start_memory
+        self.profiler.stages.append({
+            "stage": self.name,
+            "seconds": seconds,
+            "peak_bytes": peak,
+            "net_bytes": net,
+        })
+        return False
+
+
+class Profiler:
+    """Records named stages of one run (e.g. one Streamlit rerun of a page).
+
+    Stages should not be nested: each one resets the tracemalloc peak.
+    """
+
+    def __init__(self, run_name="", enabled=False, trace_memory=True):
+        self.run_name = run_name
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.stages = []
+        self._release = None
+        if self.trace_memory:
+            _acquire_tracing()
+            # Released by finish(), or when a rerun stops before reaching it
+            self._release = weakref.finalize(self, _release_tracing)
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NO_OP
+        return _Stage(self, name)
+
+    def finish(self):
+        """Release this profiler's hold on tracing and return the run record."""
+        if self._release is not None:
+            self._release()
+        return {
+            "run": self.run_name,
+            "started": self.started,
+            "total_seconds": sum(s["seconds"] for s in self.stages),
+            "stages": list(self.stages),
+        }
@@ -0,0 +1,160 @@
+"""Background jobs for long pipeline runs.
+
+Streamlit runs a page script in the session thread and restarts it on every
+widget interaction, so a long computation inside the script freezes the page
+and is thrown away by the next rerun. A :class:`Job` runs the function on a
+process-wide thread pool instead: the function reports its progress through
+the job, which is also where it learns that it was cancelled. Jobs are kept
+in a process-wide registry by id, independent of the script runs and of the
+page being viewed, so any later rerun can pick up the result. A job drops
+its result once every holder (e.g. every session that asked for it) has
+collected it, so the registry of finished jobs stays small.
+
+Threads rather than processes: results are large arrays used in place by
+the pages, and the :mod:`mcdm.cache` layers must be filled in this process.
+NumPy releases the GIL in the heavy steps.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Cancelled(Exception):
+    """Raised inside a job function once the job has been cancelled."""
+
+
+class Job:
+    """State of one background run, shared between the worker and the pages.
+
+    Cancellation is cooperative: :meth:`cancel` only sets a flag, and the
+    function stops at its next :meth:`progress` (or :meth:`check`) call.
+    The result is kept until every holder registered with :meth:`hold` has
+    called :meth:`collect`.
+    """
+
+    def __init__(self, job_id, key=None):
+        self.id = job_id
+        self.key = key
+        self.status = PENDING
+        self.fraction = 0.0
+        self.message = "Queued"
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.ended = None
+        self._cancel = threading.Event()
+        self._holders = set()
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.ended or time.time()) - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Raise :class:`Cancelled` if the job has been cancelled."""
+        if self._cancel.is_set():
+            raise Cancelled
+
+    def hold(self, holder):
+        """Keep the result until ``holder`` has collected it."""
+        with self._lock:
+            self._holders.add(holder)
+
+    def collect(self, holder):
+        """The result for ``holder``; dropped from the job once no holder is left."""
+        with self._lock:
+            result = self.result
+            self._holders.discard(holder)
+            if not self._holders:
+                self.result = None
+        return result
+
+    def progress(self, fraction, message=""):
+        """Report progress (``fraction`` in [0, 1]); raises if cancelled."""
+        self.check()
+        self.fraction = min(max(float(fraction), 0.0), 1.0)
+        self.message = message
+
+
+class JobRunner:
+    """Thread pool plus a bounded registry of recent jobs.
+
+    ``submit`` with the ``key`` of a job still queued or running returns that
+    job instead of starting the same work twice (e.g. two sessions asking for
+    the same scenario). At most ``keep`` finished jobs are remembered.
+    """
+
+    def __init__(self, max_workers=2, keep=8):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcdm-job")
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, key, func, *args, **kwargs):
+        """Run ``func(job, *args, **kwargs)`` in the background; returns the :class:`Job`."""
+        with self._lock:
+            for job in self._jobs.values():
+                if key is not None and job.key == key and not job.finished and not job.cancel_requested:
+                    return job
+            job = Job(f"job-{next(self._ids)}", key)
+            self._jobs[job.id] = job
+            self._prune()
+        self._pool.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def _run(self, job, func, args, kwargs):
+        job.started = time.time()
+        job.status = RUNNING
+        try:
+            job.check()
+            job.result = func(job, *args, **kwargs)
+            job.fraction, job.message = 1.0, "Done"
+            job.status = DONE
+        except Cancelled:
+            job.message = "Cancelled"
+            job.status = CANCELLED
+        except Exception as exc:  # reported to the page, not raised in the worker
+            job.error = exc
+            job.message = f"{type(exc).__name__}: {exc}"
+            job.status = FAILED
+        finally:
+            job.ended = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job_id]
+
+
+RUNNER = JobRunner()
@@ -0,0 +1,270 @@
+"""Design spaces exported by the sizing tools (CSV or Parquet).
+
+A source file is read once, with only the columns mapped to the criteria,
+and converted to a 2-D ``matrix.npy`` (criteria in ``INPUTS_WITH_UNITS``
+order) plus the case labels in ``.cache/design_spaces/<key>/``. The key
+hashes the file contents with the conversion options, so an edited file
+gets a new copy. Later loads memory-map ``matrix.npy`` instead of parsing
+the source again: the memmap is the decision matrix, and the criteria
+columns of the frame are views of it, so only the labels are held in
+memory.
+
+The source is read in chunks of ``CHUNK_ROWS`` rows with a ``progress``
+callback between chunks, so a background job can report the conversion and
+stop it when cancelled.
+
+When ``compact`` is on, the matrix is stored as float32 if every column
+survives the conversion: integers up to 2**24, floats within ``rtol``.
+Scoring still runs in float64 on the stored values.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from mcdm.cache import LRUCache
+from mcdm.criteria import INPUTS, INPUTS_WITH_UNITS
+from mcdm.generator import case_labels
+
+CACHE_DIR = Path(".cache") / "design_spaces"
+FORMAT_VERSION = 2
+CASE_COLUMN = "Case"
+PARQUET_SUFFIXES = (".parquet", ".pq")
+CHUNK_ROWS = 250_000
+
+# Content hashes of files already seen, keyed by (path, size, mtime).
+HASHES = LRUCache(maxsize=64, name="file hashes")
+
+
+def source_name(source):
+    """File name of a path or of an uploaded file object."""
+    return Path(getattr(source, "name", source)).name
+
+
+def is_parquet(source):
+    return Path(source_name(source)).suffix.lower() in PARQUET_SUFFIXES
+
+
+def content_hash(source, chunk_size=1 << 20):
+    """blake2b digest of a file's contents (path or binary file object)."""
+    if hasattr(source, "getvalue"):
+        return hashlib.blake2b(source.getvalue(), digest_size=16).hexdigest()
+
+    path = Path(source)
+    stat = path.stat()
+
+    def digest_file():
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(chunk_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    return HASHES.get_or_compute((str(path.resolve()), stat.st_size, stat.st_mtime_ns), digest_file)
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def _parquet_file(source):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Reading Parquet design spaces requires pyarrow (pip install pyarrow)") from exc
+    return pq.ParquetFile(_rewind(source))
+
+
+def read_header(source):
+    """Column names of a CSV/Parquet source, without reading its rows."""
+    if is_parquet(source):
+        return list(_parquet_file(source).schema_arrow.names)
+    return list(pd.read_csv(_rewind(source), nrows=0).columns)
+
+
+def _plain(name):
+    """Lower-case name without the unit in parentheses."""
+    return name.split("(")[0].strip().lower()
+
+
+def guess_columns(columns, column_map=None):
+    """Best-effort ``{criterion: source column}``; unmatched criteria are left out.
+
+    Explicit entries of ``column_map`` win (they may be keyed by the full or
+    the short criterion name). The other criteria match a column with the
+    same name, or with the same name ignoring case and units.
+    """
+    column_map = column_map or {}
+    by_plain = {_plain(c): c for c in columns}
+    mapping = {}
+    for criterion, short in zip(INPUTS_WITH_UNITS, INPUTS):
+        source = column_map.get(criterion, column_map.get(short))
+        if source is None:
+            source = criterion if criterion in columns else by_plain.get(_plain(criterion))
+        if source in columns:
+            mapping[criterion] = source
+    return mapping
+
+
+def map_columns(columns, column_map=None):
+    """Like :func:`guess_columns`, but every criterion must be mapped."""
+    mapping = guess_columns(columns, column_map)
+    missing = [c for c in INPUTS_WITH_UNITS if c not in mapping]
+    if missing:
+        raise ValueError(f"No column mapped to {missing}")
+    return mapping
+
+
+def fits_float32(values, rtol=1e-6):
+    """Whether ``values`` survive a round trip through float32."""
+    if values.dtype.kind in "iu":
+        return values.size == 0 or max(abs(int(values.min())), abs(int(values.max()))) <= 2**24
+    if values.dtype.itemsize <= 4:
+        return True
+    compact = values.astype(np.float32)
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, np.isfinite(compact)):
+        return False  # out of float32 range
+    return bool(np.allclose(compact[finite], values[finite], rtol=rtol, atol=0.0))
+
+
+def _cache_key(digest, mapping, case_column, compact, rtol):
+    options = json.dumps([FORMAT_VERSION, digest, mapping, case_column, compact, rtol], sort_keys=True)
+    return hashlib.blake2b(options.encode(), digest_size=16).hexdigest()
+
+
+def _read_chunks(source, columns, chunk_rows):
+    """``(frame, fraction read)`` for every chunk of ``columns`` of the source."""
+    if is_parquet(source):
+        parquet = _parquet_file(source)
+        n_rows = max(parquet.metadata.num_rows, 1)
+        done = 0
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+            done += batch.num_rows
+            yield batch.to_pandas(), done / n_rows
+        return
+
+    handle = _rewind(source) if hasattr(source, "read") else open(source, "rb")
+    try:
+        size = max(handle.seek(0, os.SEEK_END), 1)
+        handle.seek(0)
+        for chunk in pd.read_csv(handle, usecols=columns, chunksize=chunk_rows):
+            yield chunk, min(handle.tell() / size, 1.0)
+    finally:
+        if handle is not source:
+            handle.close()
+
+
+def _concatenate(parts):
+    return np.concatenate(parts) if parts else np.empty(0)
+
+
+def convert_design_space(source, column_map=None, case_column=CASE_COLUMN, compact=True, rtol=1e-6,
+                         cache_dir=CACHE_DIR, progress=None, chunk_rows=CHUNK_ROWS):
+    """Convert a CSV/Parquet source to the columnar cache; returns its directory.
+
+    A source that was already converted with the same options is not read
+    again. ``progress(fraction, message)`` is called after every chunk; a
+    background job passes :meth:`mcdm.jobs.Job.progress`, which raises once
+    the job is cancelled.
+    """
+    report = progress or (lambda fraction, message: None)
+    header = read_header(source)
+    mapping = map_columns(header, column_map)
+    if case_column not in header:
+        case_column = None
+    key = _cache_key(content_hash(source), mapping, case_column, compact, rtol)
+    directory = Path(cache_dir) / key
+    if (directory / "meta.json").exists():
+        return directory
+
+    columns = list(dict.fromkeys(([case_column] if case_column else []) + list(mapping.values())))
+    parts = {criterion: [] for criterion in INPUTS_WITH_UNITS}
+    label_parts = []
+    report(0.0, f"Reading {source_name(source)}")
+    for chunk, fraction in _read_chunks(source, columns, chunk_rows):
+        for criterion in INPUTS_WITH_UNITS:
+            parts[criterion].append(pd.to_numeric(chunk[mapping[criterion]]).to_numpy())
+        if case_column:
+            label_parts.append(chunk[case_column].astype(str).to_numpy(dtype=str))
+        report(0.9 * fraction, f"Reading {source_name(source)}")
+
+    columns = []
+    for criterion in INPUTS_WITH_UNITS:
+        values = _concatenate(parts.pop(criterion))
+        if values.dtype.kind not in "iuf":
+            values = values.astype(np.float64)
+        columns.append(values)
+    n_rows = len(columns[0])
+
+    report(0.9, "Writing the columnar cache")
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=cache_dir, prefix=".tmp-"))
+    try:
+        dtype = np.float32 if compact and all(fits_float32(values, rtol) for values in columns) else np.float64
+        # Filled column by column, so no 2-D copy is held in memory
+        matrix = np.lib.format.open_memmap(staging / "matrix.npy", mode="w+", dtype=dtype,
+                                           shape=(n_rows, len(columns)))
+        for j, values in enumerate(columns):
+            matrix[:, j] = values
+        matrix.flush()
+        del matrix
+        if case_column:
+            np.save(staging / "case.npy", _concatenate(label_parts).astype(str))
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "source": source_name(source),
+            "n_rows": n_rows,
+            "columns": mapping,
+            "case_column": case_column,
+            "dtype": np.dtype(dtype).str,
+        }
+        (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            # Another process converted the same file first.
+            shutil.rmtree(staging, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return directory
+
+
+def read_meta(directory):
+    return json.loads((Path(directory) / "meta.json").read_text())
+
+
+def open_design_space(directory):
+    """``(df, matrix)`` from a converted design space.
+
+    ``matrix`` is the read-only memmap of ``matrix.npy`` and the criteria
+    columns of ``df`` are views of it; only the case labels are loaded.
+    """
+    directory = Path(directory)
+    meta = read_meta(directory)
+    matrix = np.load(directory / "matrix.npy", mmap_mode="r")
+    if meta["case_column"]:
+        labels = np.load(directory / "case.npy", mmap_mode="r")
+    else:
+        labels = case_labels(meta["n_rows"])
+
+    df = pd.DataFrame(matrix, columns=INPUTS_WITH_UNITS, copy=False)
+    df.insert(0, CASE_COLUMN, labels)
+    return df, matrix
+
+
+def load_design_space(source, column_map=None, case_column=CASE_COLUMN, compact=True, rtol=1e-6,
+                      cache_dir=CACHE_DIR):
+    """``(df, matrix)`` of a CSV/Parquet source, converted on the first load."""
+    directory = convert_design_space(source, column_map, case_column, compact, rtol, cache_dir)
+    return open_design_space(directory)
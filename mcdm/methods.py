@@ -0,0 +1,193 @@
+"""Pluggable MCDM methods.
+
+Every method is a function ``method(matrix, weights, benefit, **options)``
+returning one score per row, higher is better, so that any of them can be
+ranked with :class:`mcdm.ranking.Ranking`. Methods are registered in
+``METHODS`` with :func:`register`:
+
+* ``TOPSIS`` - relative closeness to the ideal (:mod:`mcdm.topsis`);
+* ``VIKOR`` - ``1 - Q``, the compromise index of group utility and regret;
+* ``PROMETHEE II`` - net outranking flow.
+
+PROMETHEE II compares every pair of alternatives. For the ``usual`` and
+``linear`` preference functions the pairwise sums are computed exactly from
+the sorted criterion values and prefix sums, in O(n log n) per criterion.
+Other preference functions (``gaussian``) go through the O(n^2) pairwise
+kernel, evaluated in square tiles of bounded memory on a thread pool (NumPy
+releases the GIL inside the tile arithmetic).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from mcdm.topsis import as_matrix, topsis
+
+METHODS = {}
+PREFERENCES = ("usual", "linear", "gaussian")
+TILE = 1024
+
+
+def register(name):
+    """Decorator adding a scoring function to ``METHODS``."""
+    def decorator(func):
+        METHODS[name] = func
+        return func
+    return decorator
+
+
+def score(method, matrix, weights, benefit, **options):
+    """Scores of ``matrix`` under the registered ``method``."""
+    return METHODS[method](as_matrix(matrix), np.asarray(weights, dtype=np.float64), benefit, **options)
+
+
+@register("TOPSIS")
+def topsis_scores(matrix, weights, benefit):
+    return topsis(matrix, weights, benefit)
+
+
+@register("VIKOR")
+def vikor_scores(matrix, weights, benefit, v=0.5):
+    """``1 - Q``, with ``v`` the weight of the group utility (majority) strategy."""
+    best = np.where(benefit, matrix.max(axis=0), matrix.min(axis=0))
+    worst = np.where(benefit, matrix.min(axis=0), matrix.max(axis=0))
+    span = best - worst
+    span[span == 0] = 1.0
+    regret = weights * ((best - matrix) / span)
+
+    utility = regret.sum(axis=1)   # S
+    max_regret = regret.max(axis=1)  # R
+
+    def rescale(values):
+        low, high = values.min(), values.max()
+        return (values - low) / (high - low) if high > low else np.zeros_like(values)
+
+    return 1.0 - (v * rescale(utility) + (1.0 - v) * rescale(max_regret))
+
+
+def _thresholds(column, q, p):
+    """Indifference and preference thresholds of a criterion, from its spread."""
+    spread = column.std()
+    return q * spread, p * spread
+
+
+def _net_preference(d, preference, q, p):
+    """``P(d) - P(-d)`` of an array of differences, for one criterion."""
+    if preference not in PREFERENCES:
+        raise ValueError(f"Unknown preference function {preference!r} (expected one of {PREFERENCES})")
+    if preference == "usual" or (preference == "linear" and p <= q) or (preference == "gaussian" and p <= 0):
+        threshold = q if preference == "linear" else 0.0
+        return np.sign(d) * (np.abs(d) > threshold)
+    magnitude = np.abs(d)
+    if preference == "linear":
+        magnitude -= q
+        magnitude *= 1.0 / (p - q)
+        np.clip(magnitude, 0.0, 1.0, out=magnitude)
+    else:
+        magnitude *= magnitude
+        magnitude *= -0.5 / (p * p)
+        magnitude = -np.expm1(magnitude, out=magnitude)
+    return np.copysign(magnitude, d, out=magnitude)
+
+
+def sorted_net_flow(values, preference, q, p):
+    """``sum_k P(x_i - x_k) - P(x_k - x_i)`` for every ``i``, in O(n log n).
+
+    Exact for the ``usual`` and ``linear`` preference functions: with the
+    values sorted, the count and the sum of the values in every linear piece
+    come from ``searchsorted`` and a prefix sum. The queries are made in
+    sorted order too (several times faster) and scattered back at the end.
+    """
+    n = len(values)
+    perm = np.argsort(values, kind="stable")
+    x = values[perm]
+    prefix = np.concatenate([[0.0], np.cumsum(x)])
+
+    def below(bound):
+        """Number of x_k < bound."""
+        return np.searchsorted(x, bound, side="left")
+
+    def at_most(bound):
+        """Number of x_k <= bound."""
+        return np.searchsorted(x, bound, side="right")
+
+    if preference == "usual" or p <= q:
+        threshold = 0.0 if preference == "usual" else q
+        flow = (below(x - threshold) - (n - at_most(x + threshold))).astype(np.float64)
+    else:
+        width = p - q
+        # P(x_i - x_k): 1 for x_k <= x_i - p, (x_i - q - x_k) / width for x_i - p < x_k < x_i - q
+        lo, hi = at_most(x - p), below(x - q)
+        count = np.maximum(hi - lo, 0)
+        total = prefix[np.maximum(hi, lo)] - prefix[lo]
+        forward = lo + (count * (x - q) - total) / width
+        # P(x_k - x_i): 1 for x_k >= x_i + p, (x_k - x_i - q) / width for x_i + q < x_k < x_i + p
+        lo, hi = at_most(x + q), below(x + p)
+        count = np.maximum(hi - lo, 0)
+        total = prefix[np.maximum(hi, lo)] - prefix[lo]
+        backward = (n - hi) + (total - count * (x + q)) / width
+        flow = forward - backward
+
+    out = np.empty(n)
+    out[perm] = flow
+    return out
+
+
+def _tile_net_flow(oriented, weights, thresholds, preference, rows, cols):
+    """Weighted net flows of the tile ``rows x cols``, summed along both axes.
+
+    The pairwise net preference is antisymmetric, so one tile gives the
+    contribution of ``cols`` to ``rows`` and, negated, of ``rows`` to ``cols``.
+    """
+    flow = np.zeros((rows.stop - rows.start, cols.stop - cols.start))
+    for j, (q, p) in enumerate(thresholds):
+        d = oriented[rows, j, None] - oriented[None, cols, j]
+        flow += weights[j] * _net_preference(d, preference, q, p)
+    return flow.sum(axis=1), -flow.sum(axis=0)
+
+
+def pairwise_net_flow(oriented, weights, thresholds, preference, tile=TILE, max_workers=None):
+    """Weighted net flows through the O(n^2) pairwise kernel, tiled over threads.
+
+    Only the tiles on and above the diagonal are evaluated (antisymmetry).
+    Peak memory is a few ``tile x tile`` float arrays per worker.
+    """
+    n = oriented.shape[0]
+    out = np.zeros(n)
+    blocks = [slice(start, min(start + tile, n)) for start in range(0, n, tile)]
+    pairs = [(rows, cols) for i, rows in enumerate(blocks) for cols in blocks[i:]]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        flows = pool.map(lambda pair: _tile_net_flow(oriented, weights, thresholds, preference, *pair), pairs)
+        for (rows, cols), (row_flow, col_flow) in zip(pairs, flows):
+            out[rows] += row_flow
+            if rows != cols:
+                out[cols] += col_flow
+    return out
+
+
+@register("PROMETHEE II")
+def promethee_scores(matrix, weights, benefit, preference="linear", q=0.0, p=1.0, pairwise=False,
+                     tile=TILE, max_workers=None):
+    """Net outranking flow in [-1, 1].
+
+    ``q`` and ``p`` are the indifference and preference thresholds in
+    standard deviations of each criterion (``p`` is the Gaussian width).
+    ``pairwise`` forces the tiled O(n^2) kernel even where the sorted path
+    is exact.
+    """
+    n = matrix.shape[0]
+    if n < 2:
+        return np.zeros(n)
+    if preference not in PREFERENCES:
+        raise ValueError(f"Unknown preference function {preference!r} (expected one of {PREFERENCES})")
+    oriented = np.where(benefit, matrix, -matrix)
+    thresholds = [_thresholds(oriented[:, j], q, p) for j in range(oriented.shape[1])]
+
+    if preference == "gaussian" or pairwise:
+        flow = pairwise_net_flow(oriented, weights, thresholds, preference, tile, max_workers)
+    else:
+        flow = np.zeros(n)
+        for j, (q_j, p_j) in enumerate(thresholds):
+            flow += weights[j] * sorted_net_flow(np.ascontiguousarray(oriented[:, j]), preference, q_j, p_j)
+    return flow / ((n - 1) * weights.sum())
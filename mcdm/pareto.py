@@ -0,0 +1,65 @@
+"""Non-dominated (Pareto) filtering of a decision matrix.
+
+Sort-filter-skyline: rows are sorted by the sum of their min-max scaled
+costs, so a row can only be dominated by rows that come before it. Rows
+are then processed in blocks and compared, with vectorized dominance
+tests, against the front found so far and against the rest of their block.
+The cost is ``O(n * front_size * criteria)`` instead of ``O(n^2 * criteria)``.
+"""
+
+import numpy as np
+
+from mcdm.topsis import as_matrix
+
+
+def _dominated_by(points, front, chunk=256):
+    """Which ``points`` are dominated by at least one row of ``front``.
+
+    Points are dropped from the comparison as soon as they are found to be
+    dominated; since the front is in sort order, most go in the first chunks.
+    """
+    dominated = np.zeros(points.shape[0], dtype=bool)
+    alive = np.arange(points.shape[0])
+    for start in range(0, front.shape[0], chunk):
+        if alive.size == 0:
+            break
+        candidates = front[start:start + chunk]
+        rows = points[alive]
+        # One 2-D comparison per criterion is much faster than reducing a
+        # (points, front, criteria) cube over its short last axis.
+        no_worse = candidates[:, 0] <= rows[:, 0, np.newaxis]
+        equal = candidates[:, 0] == rows[:, 0, np.newaxis]
+        for c in range(1, points.shape[1]):
+            no_worse &= candidates[:, c] <= rows[:, c, np.newaxis]
+            equal &= candidates[:, c] == rows[:, c, np.newaxis]
+        hit = (no_worse & ~equal).any(axis=1)
+        dominated[alive[hit]] = True
+        alive = alive[~hit]
+    return dominated
+
+
+def pareto_front(matrix, benefit, block_size=1024):
+    """Row numbers of the non-dominated alternatives, in ascending order.
+
+    ``benefit`` marks the criteria to maximize; the others are minimized.
+    Identical rows do not dominate each other and are all kept.
+    """
+    costs = as_matrix(matrix)
+    costs = np.where(np.asarray(benefit, dtype=bool), -costs, costs)
+    low, high = costs.min(axis=0), costs.max(axis=0)
+    span = np.where(high > low, high - low, 1.0)
+    order = np.argsort(((costs - low) / span).sum(axis=1), kind="stable")
+
+    front = np.empty((0, costs.shape[1]))
+    front_rows = []
+    for start in range(0, order.shape[0], block_size):
+        rows = order[start:start + block_size]
+        block = costs[rows]
+        if front.shape[0]:
+            keep = ~_dominated_by(block, front)
+            rows, block = rows[keep], block[keep]
+        keep = ~_dominated_by(block, block)
+        front = np.concatenate([front, block[keep]])
+        front_rows.append(rows[keep])
+
+    return np.sort(np.concatenate(front_rows)) if front_rows else np.empty(0, dtype=np.intp)
@@ -0,0 +1,239 @@
+"""The scoring pipeline shared by the Tool page and the batch CLI.
+
+Both entry points go through these functions, so a scenario scored from
+the command line gives exactly the scores shown in the dashboard.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from mcdm.cache import cached_dataset, cached_normalized, cached_pareto_front, cached_scores
+from mcdm.criteria import INPUTS, INPUTS_WITH_UNITS, OPTIMIZATION
+from mcdm.disk_cache import DISK
+from mcdm.generator import apply_scenario, design_frame, generate_design_space
+from mcdm.loader import open_design_space
+from mcdm.methods import score
+from mcdm.pareto import pareto_front
+from mcdm.ranking import Ranking
+from mcdm.surrogate import DESIGN_VARIABLES, reference_surrogate, sample_designs, to_physical
+from mcdm.topsis import benefit_mask, score_normalized, vector_normalize
+
+# Defaults of the Tool page widgets.
+SCENARIO_DEFAULTS = {
+    "n_alternatives": 1000,
+    "passengers": 8,
+    "timeframe": "2035",
+    "tech_orient": "Conservative",
+    "architecture": (),
+    "electrif": "Turboprop",
+    "seed": 0,
+}
+DEFAULT_RAW_WEIGHT = 3
+
+
+def make_scenario(**values):
+    """Complete a scenario dict with the page defaults (unknown keys are rejected)."""
+    unknown = set(values) - set(SCENARIO_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown scenario fields: {', '.join(sorted(unknown))}")
+    scenario = {**SCENARIO_DEFAULTS, **values}
+    scenario["architecture"] = tuple(scenario["architecture"])
+    scenario["timeframe"] = str(scenario["timeframe"])
+    return scenario
+
+
+def simulate_design_space(scenario):
+    """Simulated ``(df, matrix)`` for a scenario dict (see :func:`make_scenario`)."""
+    matrix = generate_design_space(
+        scenario["n_alternatives"],
+        scenario["seed"],
+        passengers=scenario["passengers"],
+        timeframe=scenario["timeframe"],
+        tech_orient=scenario["tech_orient"],
+        electrif=scenario["electrif"],
+        architecture=scenario["architecture"],
+    )
+    return design_frame(matrix), matrix
+
+
+def sample_surrogate_space(scenario, weights, model="Polynomial", rounds=0, refine_fraction=0.5):
+    """``(df, matrix, designs)`` sampled through a surrogate model (see :mod:`mcdm.surrogate`).
+
+    Latin-hypercube designs get their criteria from the surrogate; the
+    scenario inputs then shift them exactly like the uniform simulation (an
+    extra design column plays the role of the architecture draw). With
+    ``rounds`` > 0 the sampling is refined around the leaders under
+    ``weights`` (unused otherwise). ``designs`` holds the design-variable
+    values of every row.
+    """
+    surrogate = reference_surrogate(model)
+    n_variables = len(DESIGN_VARIABLES)
+    scenario_inputs = {k: scenario[k] for k in ("passengers", "timeframe", "tech_orient", "electrif", "architecture")}
+
+    def evaluate(designs):
+        draws = np.empty(designs.shape)
+        draws[:, :n_variables] = surrogate.predict(designs[:, :n_variables])
+        np.clip(draws[:, :n_variables], 0.0, np.nextafter(1.0, 0.0), out=draws[:, :n_variables])
+        draws[:, n_variables] = designs[:, n_variables]
+        return apply_scenario(draws, **scenario_inputs)
+
+    designs, matrix = sample_designs(
+        evaluate,
+        n_variables + 1,
+        scenario["n_alternatives"],
+        weight_vector(weights) if rounds else None,
+        benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS),
+        rounds=rounds,
+        refine_fraction=refine_fraction,
+        seed=scenario["seed"],
+    )
+    return design_frame(matrix), matrix, to_physical(designs[:, :n_variables])
+
+
+def normalize_weights(raw_weights):
+    """Slider values (0-5, keyed by short criterion name) to weights summing to 1."""
+    weights = {inp: raw_weights.get(inp, DEFAULT_RAW_WEIGHT) for inp in INPUTS}
+    total_raw_weight = sum(weights.values())
+    if total_raw_weight <= 0:
+        raise ValueError("At least one criterion weight must be positive")
+    return {k: v / total_raw_weight for k, v in weights.items()}
+
+
+def weight_vector(weights):
+    """Normalized weight dict to an array in criteria order."""
+    return np.array([weights[inp] for inp in INPUTS])
+
+
+def score_design_space(matrix, weights, normalized=None, data_hash=None):
+    """TOPSIS scores of a design matrix under a normalized weight dict.
+
+    With the ``data_hash`` of the matrix the scores go through the score
+    caches (in memory and on disk).
+    """
+    if normalized is None:
+        normalized, _ = vector_normalize(matrix)
+    vector = weight_vector(weights)
+
+    def score():
+        return score_normalized(normalized, vector, benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS))
+
+    return score() if data_hash is None else cached_scores(data_hash, vector, score)
+
+
+def result_normalized(result):
+    """Normalized decision matrix of the rows a :class:`mcdm.store.ResultHandle` ranks.
+
+    Rows with a cache key share the normalized cache; the survivors of the
+    requirement filters have none and are normalized once per handle.
+    """
+    if result.data_hash is not None:
+        return cached_normalized(result.data_hash, result.matrix)[0]
+    if result.normalized is None:
+        result.normalized, _ = vector_normalize(result.matrix)
+    return result.normalized
+
+
+def method_scores(matrix, weights, method, **options):
+    """Scores of a design matrix under any method of :data:`mcdm.methods.METHODS`."""
+    return score(method, matrix, weight_vector(weights), benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS), **options)
+
+
+def restrict_rows(df, matrix, rows):
+    """Keep the given row numbers of ``df``/``matrix``."""
+    return df.iloc[rows].reset_index(drop=True), matrix[rows]
+
+
+def restrict_to_front(df, matrix, front=None):
+    """Keep the non-dominated rows of ``df``/``matrix``."""
+    if front is None:
+        front = pareto_front(matrix, benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS))
+    return restrict_rows(df, matrix, front)
+
+
+def rank_design_space(df, matrix, weights, top_n=10, pareto_only=False):
+    """Score and rank a design space; returns ``(df, scores, ranking)``.
+
+    With ``pareto_only`` the returned ``df`` is the Pareto front.
+    """
+    if pareto_only:
+        df, matrix = restrict_to_front(df, matrix)
+    scores = score_design_space(matrix, weights)
+    return df, scores, Ranking(scores, labels=df["Case"], top_n=top_n)
+
+
+def _persisted_design_space(key, generate):
+    """``(df, matrix)`` of a generated design space, through the on-disk cache."""
+    arrays = DISK.load(key)
+    if arrays is None:
+        df, matrix = generate()
+        DISK.save(key, {"matrix": matrix, "case": df["Case"].to_numpy(dtype=str)})
+        return df, matrix
+    return design_frame(arrays["matrix"], labels=arrays["case"]), arrays["matrix"]
+
+
+def scenario_dataset(scenario):
+    """Cached ``(df, matrix, data_hash)`` of a Tool page scenario dict.
+
+    Covers the three sources of the page: a converted sizing-tool export
+    (``"source"`` key, already stored on disk by :mod:`mcdm.loader`),
+    surrogate sampling (``"surrogate"`` key; ``"weights"`` only when refinement
+    rounds depend on them) and the uniform simulation. The generated ones are
+    also kept in the on-disk cache.
+    """
+    if "source" in scenario:
+        return cached_dataset(("file", scenario["source"]), lambda: open_design_space(scenario["source"]))
+    key = tuple(scenario.items())
+    if "surrogate" in scenario:
+        return cached_dataset(key, lambda: _persisted_design_space(
+            ("surrogate design space",) + key,
+            lambda: sample_surrogate_space(
+                scenario, dict(scenario.get("weights", ())), scenario["surrogate"], scenario["rounds"],
+            )[:2],
+        ))
+    return cached_dataset(key, lambda: _persisted_design_space(
+        ("design space",) + key, lambda: simulate_design_space(scenario),
+    ))
+
+
+@dataclass
+class Analysis:
+    """A scored and ranked scenario, as shown by the pages."""
+
+    scenario: dict
+    weights: dict
+    df: pd.DataFrame     # the whole dataset, as cached
+    matrix: np.ndarray
+    dataset_hash: str
+    rows: np.ndarray     # ranked rows of df/matrix (the Pareto front), None for all
+    data_hash: str       # cache key of the ranked rows
+    scores: np.ndarray
+    ranking: Ranking
+
+
+def analyze_scenario(scenario, weights, pareto_only=False, top_n=10, progress=None):
+    """Dataset, optional Pareto front, TOPSIS scores and ranking of a scenario.
+
+    ``progress(fraction, message)`` is called before every step; a background
+    job passes :meth:`mcdm.jobs.Job.progress`, which raises once the job is
+    cancelled. Every step goes through the :mod:`mcdm.cache` layers, so a page
+    rerun for the same scenario afterwards only hits the caches.
+    """
+    report = progress or (lambda fraction, message: None)
+    report(0.0, "Building the design space")
+    df, matrix, dataset_hash = scenario_dataset(scenario)
+    rows, data_hash, ranked = None, dataset_hash, matrix
+    if pareto_only:
+        report(0.5, "Filtering the Pareto front")
+        rows = cached_pareto_front(dataset_hash, matrix, benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS))
+        ranked = matrix[rows]
+        data_hash = f"{dataset_hash}:pareto"
+    report(0.75, "Normalizing")
+    normalized, _ = cached_normalized(data_hash, ranked)
+    report(0.85, "Scoring")
+    scores = score_design_space(ranked, weights, normalized=normalized, data_hash=data_hash)
+    report(0.95, "Ranking")
+    labels = df["Case"] if rows is None else df["Case"].iloc[rows]
+    ranking = Ranking(scores, labels=labels, top_n=max(int(top_n), 10))
+    return Analysis(scenario, weights, df, matrix, dataset_hash, rows, data_hash, scores, ranking)
@@ -0,0 +1,119 @@
+"""Ranking of scored alternatives without a full sort.
+
+Only the leaders are selected eagerly (``argpartition`` plus a sort of the
+top N). The complete order is built the first time something asks for the
+rank of an alternative outside the leaders.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class Ranking:
+    """Scores of ``n`` alternatives with a partial top-N and lazy full order.
+
+    ``labels`` (e.g. the ``Case`` column) allow lookups by name; row numbers
+    refer to the order of ``scores``. Higher scores rank first, NaN last.
+    """
+
+    def __init__(self, scores, labels=None, top_n=10):
+        self.scores = np.asarray(scores, dtype=np.float64)
+        # An Index is kept as is, so rankings of a shared dataset share its hash table
+        self.labels = labels if labels is None or isinstance(labels, pd.Index) else pd.Index(labels)
+        nan = np.isnan(self.scores)
+        self._key = np.where(nan, -np.inf, self.scores) if nan.any() else self.scores
+        n = self.scores.shape[0]
+        self.top_n = min(int(top_n), n)
+
+        if self.top_n < n:
+            leaders = np.argpartition(-self._key, self.top_n - 1)[:self.top_n]
+        else:
+            leaders = np.arange(n)
+        self.top_indices = leaders[np.argsort(-self._key[leaders], kind="stable")]
+
+        # Alternative -> rank (1-based); 0 means "not known yet".
+        self._ranks = np.zeros(n, dtype=np.int64)
+        self._ranks[self.top_indices] = np.arange(1, self.top_n + 1)
+        self._order = self.top_indices if self.top_n == n else None
+        self._top_labels = None
+
+    def __len__(self):
+        return self.scores.shape[0]
+
+    @property
+    def has_full_order(self):
+        return self._order is not None
+
+    @property
+    def order(self):
+        """Row numbers of every alternative, best first (built on first use)."""
+        if self._order is None:
+            self._order = np.argsort(-self._key, kind="stable")
+            self._ranks[self._order] = np.arange(1, len(self) + 1)
+        return self._order
+
+    @property
+    def ranks(self):
+        """1-based rank of every row (forces the full order)."""
+        self.order
+        return self._ranks
+
+    def top(self, k=None):
+        """Row numbers of the ``k`` best alternatives."""
+        k = self.top_n if k is None else int(k)
+        if k <= self.top_n:
+            return self.top_indices[:k]
+        return self.order[:k]
+
+    def top_labels(self, k=None):
+        return self.labels[self.top(k)].tolist()
+
+    def rank(self, row):
+        """1-based rank of row number ``row``."""
+        rank = self._ranks[row]
+        return int(rank) if rank else int(self.ranks[row])
+
+    def rank_of(self, label):
+        """1-based rank of the alternative called ``label``.
+
+        The leaders are looked up directly; other labels go through the
+        index, whose hash table is built on the first such lookup.
+        """
+        if self._top_labels is None:
+            self._top_labels = {name: rank for rank, name in enumerate(self.labels[self.top_indices], start=1)}
+        if label in self._top_labels:
+            return self._top_labels[label]
+        return self.rank(self.labels.get_loc(label))
+
+    def rows(self, labels):
+        """Row numbers of several labels at once."""
+        return self.labels.get_indexer(labels)
+
+
+def compare_rankings(rankings, top_n=10):
+    """Side-by-side ranks of the union of the top-N of several rankings.
+
+    ``rankings`` maps a method name to a :class:`Ranking` of the same
+    alternatives; the first one is the reference. Returns ``(table,
+    agreement)``: the ranks of every alternative that is in at least one
+    top-N (sorted by the reference rank), and per method the Spearman rank
+    correlation and the top-N overlap with the reference.
+    """
+    names = list(rankings)
+    reference = rankings[names[0]]
+    rows = np.unique(np.concatenate([r.top(top_n) for r in rankings.values()]))
+    table = pd.DataFrame(
+        {name: r.ranks[rows] for name, r in rankings.items()},
+        index=reference.labels[rows] if reference.labels is not None else rows,
+    ).sort_values(names[0])
+
+    reference_top = set(reference.top(top_n).tolist())
+    agreement = pd.DataFrame([
+        {
+            "Method": name,
+            "Spearman rank correlation": float(np.corrcoef(reference.ranks, r.ranks)[0, 1]) if len(r) > 1 else 1.0,
+            f"Top-{top_n} overlap": len(reference_top & set(r.top(top_n).tolist())) / top_n,
+        }
+        for name, r in rankings.items()
+    ])
+    return table, agreement
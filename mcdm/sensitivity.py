@@ -0,0 +1,134 @@
+"""Monte Carlo weight sensitivity and rank-reversal analysis.
+
+Weight vectors are drawn from a Dirichlet distribution centred on the
+current weights, every draw is scored with :func:`mcdm.batch.batch_topsis`
+and the rank of a set of tracked alternatives is tallied. Batches run in a
+process pool; each batch gets its own child of one ``SeedSequence``, so the
+totals do not depend on the number of workers or on completion order.
+"""
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from mcdm.batch import batch_topsis
+
+# Upper bound on the number of scores held by one batch (K * n).
+SCORE_BUDGET = 4_000_000
+
+_worker_state = {}
+
+
+def dirichlet_weights(base, n_samples, concentration, rng):
+    """Draw ``n_samples`` weight vectors around ``base``.
+
+    The mean of every draw is ``base``; a larger ``concentration`` gives
+    draws closer to it. Criteria with a zero base weight stay at zero.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    base = base / base.sum()
+    active = base > 0
+    samples = np.zeros((n_samples, base.size))
+    samples[:, active] = rng.dirichlet(concentration * base[active], size=n_samples)
+    return samples
+
+
+@dataclass
+class SensitivityResult:
+    """Running tallies for the tracked alternatives."""
+
+    tracked: np.ndarray          # row numbers of the tracked alternatives
+    max_rank: int                # ranks above this are pooled in the last bin
+    top_n: int
+    n_samples: int = 0
+    rank_counts: np.ndarray = None  # (tracked, max_rank + 1)
+    rank_sums: np.ndarray = None
+    top_n_counts: np.ndarray = None
+    winners: Counter = field(default_factory=Counter)  # row number -> times ranked #1
+
+    def __post_init__(self):
+        m = len(self.tracked)
+        if self.rank_counts is None:
+            self.rank_counts = np.zeros((m, self.max_rank + 1), dtype=np.int64)
+        if self.rank_sums is None:
+            self.rank_sums = np.zeros(m, dtype=np.int64)
+        if self.top_n_counts is None:
+            self.top_n_counts = np.zeros(m, dtype=np.int64)
+
+    def add(self, other):
+        self.n_samples += other.n_samples
+        self.rank_counts += other.rank_counts
+        self.rank_sums += other.rank_sums
+        self.top_n_counts += other.top_n_counts
+        self.winners.update(other.winners)
+
+    @property
+    def p_first(self):
+        return self.rank_counts[:, 0] / max(self.n_samples, 1)
+
+    @property
+    def p_top_n(self):
+        return self.top_n_counts / max(self.n_samples, 1)
+
+    @property
+    def mean_rank(self):
+        return self.rank_sums / max(self.n_samples, 1)
+
+
+def evaluate_weights(normalized, benefit, weight_matrix, tracked, max_rank, top_n):
+    """Tally the ranks of ``tracked`` under every row of ``weight_matrix``."""
+    batch = batch_topsis(normalized, weight_matrix, benefit, top_n=1)
+    scores = np.where(np.isnan(batch.scores), -np.inf, batch.scores)
+    result = SensitivityResult(tracked=np.asarray(tracked), max_rank=max_rank, top_n=top_n)
+    for j, row in enumerate(result.tracked):
+        ranks = 1 + (scores > scores[:, row:row + 1]).sum(axis=1)
+        result.rank_counts[j] = np.bincount(np.minimum(ranks, max_rank + 1) - 1, minlength=max_rank + 1)
+        result.rank_sums[j] = ranks.sum()
+        result.top_n_counts[j] = (ranks <= top_n).sum()
+    result.winners.update(batch.top_indices[:, 0].tolist())
+    result.n_samples = weight_matrix.shape[0]
+    return result
+
+
+def _init_worker(normalized, benefit):
+    _worker_state["normalized"] = normalized
+    _worker_state["benefit"] = benefit
+
+
+def _run_batch(base, n_samples, concentration, seed, tracked, max_rank, top_n):
+    rng = np.random.default_rng(seed)
+    weight_matrix = dirichlet_weights(base, n_samples, concentration, rng)
+    return evaluate_weights(_worker_state["normalized"], _worker_state["benefit"],
+                            weight_matrix, tracked, max_rank, top_n)
+
+
+def batch_sizes(n_samples, n_rows, batch_size):
+    """Split ``n_samples`` into batches that keep ``batch * n_rows`` under budget."""
+    batch_size = max(1, min(batch_size, SCORE_BUDGET // max(n_rows, 1)))
+    full, rest = divmod(n_samples, batch_size)
+    return [batch_size] * full + ([rest] if rest else [])
+
+
+def run_sensitivity(normalized, benefit, base_weights, tracked, n_samples=1000,
+                    concentration=50.0, top_n=3, max_rank=10, seed=0,
+                    batch_size=100, max_workers=None):
+    """Run the analysis, yielding the cumulative result as each batch finishes.
+
+    The last yielded value holds the complete tallies.
+    """
+    tracked = np.asarray(tracked, dtype=np.int64)
+    sizes = batch_sizes(n_samples, normalized.shape[0], batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    total = SensitivityResult(tracked=tracked, max_rank=max_rank, top_n=top_n)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(normalized, benefit)) as pool:
+        futures = [
+            pool.submit(_run_batch, base_weights, size, concentration, child, tracked, max_rank, top_n)
+            for size, child in zip(sizes, seeds)
+        ]
+        for future in as_completed(futures):
+            total.add(future.result())
+            yield total
@@ -0,0 +1,141 @@
+"""Weight-stability intervals of the top-k ranking.
+
+When one slider of the Tool page moves, the weights are renormalized
+(``v / total_raw_weight``): criterion ``j`` gets a share ``t`` and every
+other weight is scaled by ``(1 - t) / (1 - w_j)``. Positive column scaling
+does not move the ideal and anti-ideal rows, so the squared distances of
+every alternative are exact quadratics in ``t``::
+
+    D+^2(t) = t^2 A+ + (1 - t)^2 B+        D-^2(t) = t^2 A- + (1 - t)^2 B-
+
+with ``A`` the squared deviation on criterion ``j`` and ``B`` the weighted
+squared deviations on the others, renormalized. Alternative ``a`` scores
+above ``b`` iff ``D-_a D+_b > D-_b D+_a``, and the difference of the squares
+of both sides is::
+
+    alpha (1 - t)^4 + beta t^2 (1 - t)^2 + gamma t^4
+
+which is a quadratic in ``u = (t / (1 - t))^2``. Its roots are the exact
+weight shares at which the two alternatives swap places; they are computed
+for all candidate pairs at once: consecutive members of the top k, and the
+k-th one against every alternative outside the top k. The stability
+interval of a criterion runs between the nearest roots on either side of
+the current weight.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from mcdm.topsis import ideal_points
+
+
+@dataclass
+class StabilityInterval:
+    """Weight shares of one criterion that keep the top-k order unchanged."""
+
+    criterion: int
+    weight: float       # current share
+    low: float
+    high: float
+    low_pair: tuple = None   # (row that moves up, row it passes) at ``low``
+    high_pair: tuple = None  # same at ``high``
+
+
+def crossing_times(alpha, beta, gamma):
+    """Roots in (0, 1) of ``alpha (1-t)^4 + beta t^2 (1-t)^2 + gamma t^4``.
+
+    Returns a ``(m, 2)`` array, NaN where there is no root.
+    """
+    alpha, beta, gamma = (np.asarray(v, dtype=np.float64) for v in (alpha, beta, gamma))
+    u = np.full((alpha.shape[0], 2), np.nan)
+    quadratic = gamma != 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        disc = beta * beta - 4.0 * alpha * gamma
+        root = np.sqrt(disc)
+        # Numerically stable pair of roots: q / gamma and alpha / q
+        q = -0.5 * (beta + np.copysign(root, beta))
+        u[:, 0] = np.where(quadratic, q / gamma, np.where(beta != 0, -alpha / beta, np.nan))
+        u[:, 1] = np.where(quadratic, alpha / q, np.nan)
+    u[(u < 0) | ~np.isfinite(u)] = np.nan
+    s = np.sqrt(u)
+    return s / (1.0 + s)
+
+
+class DistanceTerms:
+    """Squared deviations of every row from the ideals, shared by all criteria."""
+
+    def __init__(self, normalized, weights, benefit):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        # The ideal rows do not depend on the weights
+        ideal, anti_ideal = ideal_points(normalized, benefit)
+        self.deviations = []
+        self.weighted = []
+        squared_weights = self.weights ** 2
+        for target in (ideal, anti_ideal):
+            deviation = normalized - target
+            deviation *= deviation
+            self.deviations.append(deviation)
+            self.weighted.append(deviation @ squared_weights)
+
+    def __call__(self, j):
+        """``(A+, B+, A-, B-)`` of every row for criterion ``j`` (see the module docstring)."""
+        w = self.weights[j]
+        rest = (1.0 - w) ** 2
+        terms = []
+        for deviation, weighted in zip(self.deviations, self.weighted):
+            a = deviation[:, j]
+            b = np.maximum(weighted - w * w * a, 0.0) / rest if rest > 0 else np.zeros_like(a)
+            terms += [a, b]
+        return terms
+
+
+def stability_interval(terms, j, top_rows):
+    """:class:`StabilityInterval` of criterion ``j`` for the order ``top_rows`` (best first).
+
+    ``terms`` is the :class:`DistanceTerms` of the matrix and current weights.
+    """
+    a_plus, b_plus, a_minus, b_minus = terms(j)
+    top_rows = np.asarray(top_rows)
+    outside = np.ones(a_plus.shape[0], dtype=bool)
+    outside[top_rows] = False
+    # Pairs (upper, lower) whose order must hold
+    upper = np.concatenate([top_rows[:-1], np.full(outside.sum(), top_rows[-1])])
+    lower = np.concatenate([top_rows[1:], np.flatnonzero(outside)])
+
+    alpha = b_minus[upper] * b_plus[lower] - b_minus[lower] * b_plus[upper]
+    beta = (b_minus[upper] * a_plus[lower] + a_minus[upper] * b_plus[lower]
+            - b_minus[lower] * a_plus[upper] - a_minus[lower] * b_plus[upper])
+    gamma = a_minus[upper] * a_plus[lower] - a_minus[lower] * a_plus[upper]
+    # Positive at both ends with a positive middle coefficient: no crossing
+    candidates = np.flatnonzero(~((alpha > 0) & (gamma > 0) & (beta >= 0)))
+    times = crossing_times(alpha[candidates], beta[candidates], gamma[candidates])
+
+    t0 = float(terms.weights[j])
+    low, high, low_pair, high_pair = 0.0, 1.0, None, None
+    if candidates.size:
+        below = np.where(times < t0, times, -np.inf).max(axis=1)
+        above = np.where(times > t0, times, np.inf).min(axis=1)
+        i = int(np.argmax(below))
+        if np.isfinite(below[i]):
+            pair = candidates[i]
+            low, low_pair = float(below[i]), (int(lower[pair]), int(upper[pair]))
+        i = int(np.argmin(above))
+        if np.isfinite(above[i]):
+            pair = candidates[i]
+            high, high_pair = float(above[i]), (int(lower[pair]), int(upper[pair]))
+    return StabilityInterval(j, t0, low, high, low_pair, high_pair)
+
+
+def stability_intervals(normalized, weights, benefit, top_rows):
+    """One :class:`StabilityInterval` per criterion."""
+    terms = DistanceTerms(normalized, weights, benefit)
+    return [stability_interval(terms, j, top_rows) for j in range(normalized.shape[1])]
+
+
+def share_to_raw(share, raw_weights, j):
+    """Slider value of criterion ``j`` giving it the weight ``share``, the other sliders fixed."""
+    others = sum(raw_weights) - raw_weights[j]
+    if share >= 1.0:
+        return np.inf
+    return share * others / (1.0 - share)
@@ -0,0 +1,272 @@
+"""Process-wide store of the design spaces shown to every session.
+
+Each session used to keep its own results frame (criteria plus a score
+column, re-indexed by case), so N analysts looking at the same design space
+held N copies of it. The store keeps one :class:`Dataset` per content hash
+and is the only owner of the data: the dataset layer of :mod:`mcdm.cache`
+maps scenarios to hashes and gets the data from here, so an evicted dataset
+is really freed once no session uses it. A session keeps a
+:class:`ResultHandle`: a reference to the shared dataset, the row numbers it
+ranks (all of them, or e.g. the Pareto front) plus its own score vector and
+:class:`mcdm.ranking.Ranking` (scores and a lazily built rank permutation,
+O(n) numbers instead of a frame).
+
+Entries are reference counted. Opening a handle increments the count of its
+entry and a ``weakref.finalize`` hook decrements it when the handle is
+garbage collected, i.e. when the session ends or replaces its result.
+Unreferenced entries stay cached until the memory budget is exceeded; the
+least recently used of them are evicted first. Referenced entries are never
+evicted, so the budget may be exceeded while they are in use. A dataset is
+built outside the store lock behind a per-key placeholder: other sessions
+opening the same key wait for it instead of building it again.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BUDGET_BYTES = 2 * 2**30
+
+
+@dataclass
+class Dataset:
+    """Case and criteria frame of a design space, its decision matrix and case labels."""
+
+    frame: pd.DataFrame
+    matrix: np.ndarray
+    labels: pd.Index
+    case_column: str = "Case"
+    nbytes: int = 0
+
+    @classmethod
+    def from_frame(cls, df, matrix, case_column="Case"):
+        """Wrap ``df``/``matrix`` without copying them; only the label index is built."""
+        nbytes = int(df.memory_usage(index=True, deep=True).sum())
+        if isinstance(matrix, np.memmap):
+            nbytes -= matrix.nbytes  # the criteria columns are views of the memmap
+        else:
+            nbytes += matrix.nbytes
+        return cls(df, matrix, pd.Index(df[case_column]), case_column, max(nbytes, 0))
+
+    @property
+    def criteria(self):
+        return [c for c in self.frame.columns if c != self.case_column]
+
+
+class ResultHandle:
+    """A session's reference to a stored dataset, with its own scores and ranking.
+
+    ``rows`` are the dataset rows that are ranked (``None``: every row) and
+    ``data_hash`` the cache key of that space, or ``None`` when it has none
+    (the survivors of the requirement filters: every slider move gives a new
+    set). ``view`` names the rows for session-level caches; ``normalized``
+    keeps the normalized matrix of rows without a cache key.
+    """
+
+    def __init__(self, store, key, dataset, rows=None, data_hash=None, view=None):
+        self.key = key
+        self.dataset = dataset
+        self.rows = rows
+        self.data_hash = data_hash
+        self.view = view or data_hash or key
+        self.normalized = None
+        self.scores = None
+        self.ranking = None
+        self.weights = None
+        self._labels = None
+        self._matrix = None
+        self._finalizer = weakref.finalize(self, store.release, key)
+
+    @property
+    def frame(self):
+        """The shared frame of the whole dataset (see ``rows``)."""
+        return self.dataset.frame
+
+    @property
+    def criteria(self):
+        return self.dataset.criteria
+
+    @property
+    def n_rows(self):
+        return len(self.dataset.frame) if self.rows is None else len(self.rows)
+
+    @property
+    def matrix(self):
+        """Decision matrix of the ranked rows (copied once for a subset)."""
+        if self.rows is None:
+            return self.dataset.matrix
+        if self._matrix is None:
+            self._matrix = self.dataset.matrix[self.rows]
+        return self._matrix
+
+    @property
+    def labels(self):
+        if self.rows is None:
+            return self.dataset.labels
+        if self._labels is None:
+            self._labels = self.dataset.labels[self.rows]
+        return self._labels
+
+    def positions(self, rows):
+        """Dataset rows of the positions ``rows``."""
+        rows = np.asarray(rows, dtype=np.int64)
+        return rows if self.rows is None else self.rows[rows]
+
+    def take(self, rows):
+        """Criteria of the positions ``rows``, indexed by case (a small copy)."""
+        return self.dataset.frame.iloc[self.positions(rows)].set_index(self.dataset.case_column)
+
+    def bounds(self):
+        """``(low, high)`` Series of the criteria over the selected rows."""
+        matrix = self.matrix
+        return pd.Series(matrix.min(axis=0), index=self.criteria), pd.Series(matrix.max(axis=0), index=self.criteria)
+
+    def set_result(self, scores, ranking, weights):
+        self.scores, self.ranking, self.weights = scores, ranking, weights
+        return self
+
+    def release(self):
+        """Give the reference back now instead of at garbage collection."""
+        self._finalizer()
+
+
+class _Entry:
+    __slots__ = ("dataset", "refs", "ready")
+
+    def __init__(self):
+        self.dataset = None  # placeholder until the build is done
+        self.refs = 0
+        self.ready = threading.Event()
+
+
+class ResultStore:
+    """Reference-counted datasets keyed by content hash, with a memory-budget LRU."""
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES, name="result store"):
+        self.budget_bytes = budget_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        # Re-entrant: a finalizer can run (and release) while the lock is held
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def nbytes(self):
+        return sum(entry.dataset.nbytes for entry in self._entries.values() if entry.dataset is not None)
+
+    def refs(self, key):
+        entry = self._entries.get(key)
+        return entry.refs if entry is not None else 0
+
+    def open(self, key, build, rows=None, data_hash=None, view=None):
+        """A new :class:`ResultHandle` on ``key``; ``build()`` returns the :class:`Dataset` on a miss.
+
+        ``rows``, ``data_hash`` and ``view`` describe the rows of the handle
+        (see :class:`ResultHandle`).
+        """
+        return ResultHandle(self, key, self._acquire(key, build), rows, data_hash, view)
+
+    def dataset(self, key, build):
+        """The :class:`Dataset` of ``key`` without keeping a reference to it (built on a miss)."""
+        dataset = self._acquire(key, build)
+        self.release(key)
+        return dataset
+
+    def _acquire(self, key, build):
+        """Take a reference to the entry of ``key`` and return its dataset."""
+        with self._lock:
+            entry = self._entries.get(key)
+            builder = entry is None
+            if builder:
+                self.misses += 1
+                entry = self._entries[key] = _Entry()
+            else:
+                self.hits += 1
+            # Counted before the build, so the placeholder cannot be evicted
+            entry.refs += 1
+            self._entries.move_to_end(key)
+
+        if builder:
+            try:
+                entry.dataset = build()
+            except BaseException:
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                entry.ready.set()
+                raise
+            entry.ready.set()
+            with self._lock:
+                self._evict()
+        else:
+            entry.ready.wait()
+            if entry.dataset is None:
+                # The build failed in another session; try it here
+                return self._acquire(key, build)
+        return entry.dataset
+
+    def release(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refs > 0:
+                entry.refs -= 1
+                self._evict()
+
+    def _evict(self):
+        total = self.nbytes
+        for key in list(self._entries):
+            if total <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refs == 0:
+                del self._entries[key]
+                total -= entry.dataset.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every unreferenced entry."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.refs == 0]:
+                del self._entries[key]
+
+    def stats(self):
+        total = self.hits + self.misses
+        with self._lock:
+            referenced = sum(1 for entry in self._entries.values() if entry.refs)
+            nbytes = self.nbytes
+        return {
+            "cache": self.name,
+            "entries": len(self._entries),
+            "referenced": referenced,
+            "MiB": nbytes / 2**20,
+            "budget MiB": self.budget_bytes / 2**20,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit rate": self.hits / total if total else 0.0,
+        }
+
+
+STORE = ResultStore()
+
+
+def open_result(key, df, matrix, rows=None, data_hash=None, view=None):
+    """Handle on the shared ``df``/``matrix`` (stored under ``key``, their content hash).
+
+    ``rows`` selects the rows the session ranks, ``data_hash`` is their cache
+    key and ``view`` their session-level name (see :class:`ResultHandle`).
+    By default the handle covers every row under ``key``.
+    """
+    return STORE.open(key, lambda: Dataset.from_frame(df, matrix), rows, data_hash, view)
@@ -0,0 +1,148 @@
+"""Out-of-core TOPSIS over design spaces that do not fit in memory.
+
+The decision matrix is read in chunks from a 2-D ``.npy`` file (through a
+read-only memmap) or from a Parquet file (record batches). Two passes are
+made over the data:
+
+1. column sums of squares and raw min/max, which give the vector norms and,
+   since weighting is a non-negative per-column scale, the weighted
+   ideal/anti-ideal points;
+2. scoring, keeping only a bounded top-N heap (and optionally writing every
+   score to an on-disk ``.npy`` memmap).
+
+Peak memory is proportional to ``chunk_rows * n_criteria``, independent of
+the number of alternatives.
+"""
+
+import heapq
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from mcdm.topsis import closeness
+
+DEFAULT_CHUNK_ROWS = 250_000
+
+
+@dataclass
+class StreamResult:
+    """Outcome of a streaming TOPSIS run."""
+
+    indices: np.ndarray  # row numbers of the top-N, best first
+    scores: np.ndarray   # matching TOPSIS scores
+    n_rows: int
+    norms: np.ndarray
+
+
+def iter_npy_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, columns=None):
+    """Yield ``(start_row, block)`` from a 2-D ``.npy`` file without loading it."""
+    data = np.load(path, mmap_mode="r")
+    if data.ndim != 2:
+        raise ValueError(f"{path}: expected a 2-D array, got shape {data.shape}")
+    for start in range(0, data.shape[0], chunk_rows):
+        block = data[start:start + chunk_rows]
+        if columns is not None:
+            block = block[:, columns]
+        yield start, np.asarray(block, dtype=np.float64)
+
+
+def iter_parquet_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, columns=None):
+    """Yield ``(start_row, block)`` from a Parquet file, one record batch at a time."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Reading Parquet design spaces requires pyarrow (pip install pyarrow)") from exc
+
+    parquet_file = pq.ParquetFile(path)
+    start = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+        block = np.column_stack([
+            batch.column(i).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            for i in range(batch.num_columns)
+        ])
+        yield start, block
+        start += block.shape[0]
+
+
+def iter_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS, columns=None):
+    """Dispatch on the file suffix (``.npy`` or ``.parquet``/``.pq``)."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".npy":
+        return iter_npy_chunks(path, chunk_rows, columns)
+    if suffix in (".parquet", ".pq"):
+        return iter_parquet_chunks(path, chunk_rows, columns)
+    raise ValueError(f"Unsupported design-space file for streaming: {path}")
+
+
+def column_statistics(chunks):
+    """First pass: row count, column sums of squares, minima and maxima."""
+    n_rows = 0
+    sumsq = col_min = col_max = None
+    for _, block in chunks:
+        if block.shape[0] == 0:
+            continue
+        if sumsq is None:
+            sumsq = np.zeros(block.shape[1])
+            col_min = np.full(block.shape[1], np.inf)
+            col_max = np.full(block.shape[1], -np.inf)
+        sumsq += np.einsum("ij,ij->j", block, block)
+        np.minimum(col_min, block.min(axis=0), out=col_min)
+        np.maximum(col_max, block.max(axis=0), out=col_max)
+        n_rows += block.shape[0]
+    if n_rows == 0:
+        raise ValueError("The design space is empty")
+    return n_rows, sumsq, col_min, col_max
+
+
+def push_top_n(heap, scores, offset, top_n):
+    """Merge a block of scores into a bounded min-heap of ``(score, row)``."""
+    valid = np.flatnonzero(~np.isnan(scores))
+    if valid.size > top_n:
+        valid = valid[np.argpartition(scores[valid], -top_n)[-top_n:]]
+    for i in valid:
+        item = (float(scores[i]), offset + int(i))
+        if len(heap) < top_n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+
+def stream_topsis(path, weights, benefit, top_n=10, chunk_rows=DEFAULT_CHUNK_ROWS,
+                  columns=None, scores_path=None):
+    """Rank a design-space file with TOPSIS in two bounded-memory passes.
+
+    ``columns`` selects criteria (indices for ``.npy``, names for Parquet) in
+    the same order as ``weights`` and ``benefit``. When ``scores_path`` is
+    given, the score of every row is also written to that ``.npy`` file.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    benefit = np.asarray(benefit, dtype=bool)
+
+    n_rows, sumsq, col_min, col_max = column_statistics(iter_chunks(path, chunk_rows, columns))
+    norms = np.sqrt(sumsq)
+    scale = weights / np.where(norms != 0, norms, 1.0)
+    ideal = np.where(benefit, col_max, col_min) * scale
+    anti_ideal = np.where(benefit, col_min, col_max) * scale
+
+    scores_out = None
+    if scores_path is not None:
+        scores_out = np.lib.format.open_memmap(scores_path, mode="w+", dtype=np.float64, shape=(n_rows,))
+
+    heap = []
+    for start, block in iter_chunks(path, chunk_rows, columns):
+        scores = closeness(block * scale, ideal, anti_ideal)
+        if scores_out is not None:
+            scores_out[start:start + scores.shape[0]] = scores
+        push_top_n(heap, scores, start, top_n)
+
+    if scores_out is not None:
+        scores_out.flush()
+
+    best = sorted(heap, reverse=True)
+    return StreamResult(
+        indices=np.array([row for _, row in best], dtype=np.int64),
+        scores=np.array([score for score, _ in best]),
+        n_rows=n_rows,
+        norms=norms,
+    )
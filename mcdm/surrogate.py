@@ -0,0 +1,197 @@
+"""Design-variable sampling through a response-surface surrogate.
+
+Alternatives are generated from design variables instead of independent
+criteria draws: Latin-hypercube designs in the unit cube are mapped to the
+six criteria by a surrogate model evaluated in batched matrix form.
+
+Two surrogates are available, both fitted by least squares on
+``(design, response)`` pairs in unit coordinates:
+
+* :class:`PolynomialSurrogate` - full polynomial of a given degree;
+* :class:`RBFSurrogate` - Gaussian radial basis functions on a linear trend.
+
+Until runs of the sizing code are available, :func:`reference_surrogate`
+fits them to :func:`reference_response`, a notional closed-form response
+whose trends (electrification cuts NOx and energy but costs price and
+speed, etc.) only make the sampled space plausible.
+
+:func:`sample_designs` can refine the sampling around the current leaders:
+each round ranks the designs drawn so far and adds Latin-hypercube boxes
+around the top ones, shrinking the boxes from one round to the next.
+"""
+
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from mcdm.ranking import Ranking
+from mcdm.topsis import topsis
+
+# Design variables and their ranges; samples live in the unit cube.
+DESIGN_VARIABLES = {
+    "Electrification ratio": (0.0, 1.0),
+    "Battery specific energy (Wh/kg)": (250.0, 800.0),
+    "Wing loading (kg/m2)": (250.0, 550.0),
+    "Aspect ratio": (8.0, 14.0),
+    "Design cruise Mach": (0.40, 0.80),
+    "Thrust-to-weight ratio": (0.25, 0.40),
+}
+BLOCK_ROWS = 65_536
+
+
+def latin_hypercube(n, n_dims, rng):
+    """``(n, n_dims)`` Latin-hypercube sample of the unit cube.
+
+    Every column has exactly one point in each of the ``n`` strata.
+    """
+    sample = rng.random((n, n_dims))
+    for j in range(n_dims):
+        sample[:, j] += rng.permutation(n)
+    sample /= n
+    return sample
+
+
+def to_physical(unit):
+    """Unit-cube designs to design-variable values."""
+    low = np.array([low for low, _ in DESIGN_VARIABLES.values()])
+    high = np.array([high for _, high in DESIGN_VARIABLES.values()])
+    return low + unit * (high - low)
+
+
+def reference_response(unit):
+    """Notional criteria of unit-cube designs, as fractions of the baseline ranges.
+
+    Columns follow ``INPUTS_WITH_UNITS``; values are roughly in [0, 1].
+    """
+    e, b, w, a, m, t = unit.T
+    weak_battery = e * (1.0 - b)
+    return np.column_stack([
+        0.20 + 0.50 * m + 0.15 * t + 0.15 * w - 0.20 * weak_battery,           # cruise speed
+        0.40 + 0.25 * m * m - 0.25 * e * b - 0.15 * a + 0.10 * w + 0.25 * weak_battery,  # energy
+        0.35 + 0.30 * weak_battery + 0.20 * m - 0.10 * a + 0.10 * t + 0.05 * e,  # operating cost
+        0.50 + 0.25 * weak_battery - 0.20 * m - 0.10 * a + 0.10 * e * e,         # required yield
+        0.20 + 0.35 * e + 0.15 * e * b + 0.10 * a + 0.10 * t + 0.05 * m,         # acquisition price
+        0.85 - 0.80 * e + 0.10 * m + 0.05 * t - 0.05 * a,                        # NOx
+    ])
+
+
+def _blocks(n, block_rows):
+    for start in range(0, n, block_rows):
+        yield slice(start, min(start + block_rows, n))
+
+
+class PolynomialSurrogate:
+    """Full polynomial response surface (all monomials up to ``degree``)."""
+
+    def __init__(self, degree=2):
+        self.degree = degree
+        self.terms = None
+        self.coef = None
+
+    def features(self, unit):
+        # Every monomial is its lower-degree prefix times one more variable
+        out = np.empty((unit.shape[0], len(self.terms) + 1))
+        out[:, 0] = 1.0
+        column = {(): 0}
+        for i, term in enumerate(self.terms, start=1):
+            np.multiply(out[:, column[tuple(term[:-1])]], unit[:, term[-1]], out=out[:, i])
+            column[tuple(term)] = i
+        return out
+
+    def fit(self, unit, response):
+        n_dims = unit.shape[1]
+        self.terms = [
+            list(term)
+            for degree in range(1, self.degree + 1)
+            for term in combinations_with_replacement(range(n_dims), degree)
+        ]
+        self.coef, *_ = np.linalg.lstsq(self.features(unit), response, rcond=None)
+        return self
+
+    def predict(self, unit, block_rows=BLOCK_ROWS):
+        out = np.empty((unit.shape[0], self.coef.shape[1]))
+        for rows in _blocks(unit.shape[0], block_rows):
+            np.matmul(self.features(unit[rows]), self.coef, out=out[rows])
+        return out
+
+
+class RBFSurrogate:
+    """Gaussian RBF interpolation of the residuals of a linear trend."""
+
+    def __init__(self, length_scale=0.5, ridge=1e-8):
+        self.length_scale = length_scale
+        self.ridge = ridge
+        self.centers = None
+        self.trend = None
+        self.rbf_weights = None
+
+    @staticmethod
+    def _linear(unit):
+        return np.column_stack([np.ones(unit.shape[0]), unit])
+
+    def _kernel(self, unit):
+        # |x - c|^2 = |x|^2 + |c|^2 - 2 x.c, as one matrix product
+        sq = (unit * unit).sum(axis=1)[:, None] + self._center_sq[None, :] - 2.0 * unit @ self.centers.T
+        np.maximum(sq, 0.0, out=sq)
+        sq *= -1.0 / self.length_scale ** 2
+        return np.exp(sq, out=sq)
+
+    def fit(self, unit, response):
+        self.centers = np.ascontiguousarray(unit)
+        self._center_sq = (self.centers * self.centers).sum(axis=1)
+        self.trend, *_ = np.linalg.lstsq(self._linear(unit), response, rcond=None)
+        residual = response - self._linear(unit) @ self.trend
+        gram = self._kernel(unit)
+        gram[np.diag_indices_from(gram)] += self.ridge
+        self.rbf_weights = np.linalg.solve(gram, residual)
+        return self
+
+    def predict(self, unit, block_rows=BLOCK_ROWS // 8):
+        out = np.empty((unit.shape[0], self.trend.shape[1]))
+        for rows in _blocks(unit.shape[0], block_rows):
+            block = unit[rows]
+            out[rows] = self._linear(block) @ self.trend + self._kernel(block) @ self.rbf_weights
+        return out
+
+
+SURROGATES = {"Polynomial": PolynomialSurrogate, "RBF": RBFSurrogate}
+_FITTED = {}
+
+
+def reference_surrogate(kind="Polynomial", n_train=256, seed=0):
+    """A surrogate of ``kind`` fitted on a Latin hypercube of :func:`reference_response`."""
+    key = (kind, n_train, seed)
+    if key not in _FITTED:
+        unit = latin_hypercube(n_train, len(DESIGN_VARIABLES), np.random.default_rng(seed))
+        _FITTED[key] = SURROGATES[kind]().fit(unit, reference_response(unit))
+    return _FITTED[key]
+
+
+def refine_around(centers, n, radius, rng):
+    """``n`` designs in Latin-hypercube boxes of half-width ``radius`` around ``centers``."""
+    offsets = 2.0 * latin_hypercube(n, centers.shape[1], rng) - 1.0
+    designs = centers[np.arange(n) % len(centers)] + radius * offsets
+    return np.clip(designs, 0.0, np.nextafter(1.0, 0.0))
+
+
+def sample_designs(evaluate, n_dims, n_designs, weights, benefit, rounds=0, refine_fraction=0.5,
+                   top_k=50, radius=0.15, shrink=0.5, seed=0):
+    """Latin-hypercube designs, optionally refined around the top-ranked region.
+
+    ``evaluate(designs)`` maps ``(n, n_dims)`` unit-cube designs to the
+    decision matrix. With ``rounds`` > 0, ``refine_fraction`` of the designs
+    are spent in the refinement rounds; each round ranks everything drawn so
+    far with TOPSIS and samples boxes around the ``top_k`` leaders, the box
+    radius shrinking by ``shrink`` every round. Returns ``(designs, matrix)``.
+    """
+    rng = np.random.default_rng(seed)
+    n_refine = int(n_designs * refine_fraction) // rounds if rounds else 0
+    designs = latin_hypercube(n_designs - n_refine * rounds, n_dims, rng)
+    matrix = evaluate(designs)
+    for round_ in range(rounds):
+        scores = topsis(matrix, weights, benefit)
+        leaders = designs[Ranking(scores, top_n=top_k).top()]
+        new = refine_around(leaders, n_refine, radius * shrink ** round_, rng)
+        designs = np.concatenate([designs, new])
+        matrix = np.concatenate([matrix, evaluate(new)])
+    return designs, matrix
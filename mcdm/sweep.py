@@ -0,0 +1,112 @@
+"""Sweep of the whole scenario grid of the Tool page.
+
+Every combination of aircraft size, time frame, technology confidence and
+electric architecture (none, or one of :data:`ARCHITECTURE_FACTORS`) is
+simulated and scored with TOPSIS under one weight set; the best aircraft
+and score of each cell are kept.
+
+All cells share the number of alternatives and the seed, hence one block of
+:func:`mcdm.generator.base_draws`: it is drawn once, handed to every worker
+of a process pool, and a cell only costs the affine map of the draws to its
+criteria (:func:`mcdm.generator.apply_scenario`), a normalization and the
+scoring. A cell gives the same scores as the Tool page run of the same
+scenario. Cells are scored in chunks and the sweep yields after every
+finished chunk, so the page can fill the heatmap as it goes.
+"""
+
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from mcdm.criteria import INPUTS_WITH_UNITS
+from mcdm.generator import (ARCHITECTURE_FACTORS, INTEGER_CRITERIA, TECH_FACTORS, TIMEFRAME_FACTORS, apply_scenario,
+                            base_draws)
+from mcdm.topsis import score_normalized, vector_normalize
+
+# Options of the Tool page widgets.
+PASSENGER_OPTIONS = [8, 20, 50, 70, 100, 150, 210, 300]
+TIMEFRAME_OPTIONS = list(TIMEFRAME_FACTORS)
+TECH_OPTIONS = list(TECH_FACTORS)
+ARCHITECTURE_OPTIONS = [()] + [(name,) for name in ARCHITECTURE_FACTORS]
+
+CHUNK_CELLS = 24  # cells per pool task
+
+_worker_state = {}
+
+
+def scenario_grid(passengers=PASSENGER_OPTIONS, timeframes=TIMEFRAME_OPTIONS, tech_orients=TECH_OPTIONS,
+                  architectures=ARCHITECTURE_OPTIONS):
+    """Every combination of the swept inputs, as partial scenario dicts."""
+    return [
+        {"passengers": p, "timeframe": str(t), "tech_orient": o, "architecture": tuple(a)}
+        for p, t, o, a in itertools.product(passengers, timeframes, tech_orients, architectures)
+    ]
+
+
+def architecture_label(architecture):
+    return " + ".join(architecture) if architecture else "None"
+
+
+@dataclass
+class SweepResult:
+    """Best aircraft of every cell scored so far."""
+
+    n_cells: int
+    records: list = field(default_factory=list)
+
+    @property
+    def n_done(self):
+        return len(self.records)
+
+    def frame(self):
+        """One row per finished cell: scenario inputs, best aircraft, its score and criteria."""
+        frame = pd.DataFrame(self.records)
+        if frame.empty:
+            return frame
+        return frame.astype({c: "int64" for c, is_integer in zip(INPUTS_WITH_UNITS, INTEGER_CRITERIA) if is_integer})
+
+
+def _init_worker(draws, weights, benefit, electrif):
+    _worker_state.update(draws=draws, weights=weights, benefit=benefit, electrif=electrif)
+
+
+def _score_cells(cells):
+    state = _worker_state
+    records = []
+    for cell in cells:
+        matrix = apply_scenario(state["draws"], electrif=state["electrif"], **cell)
+        normalized, _ = vector_normalize(matrix)
+        scores = score_normalized(normalized, state["weights"], state["benefit"])
+        best = int(np.argmax(np.nan_to_num(scores, nan=-np.inf)))
+        records.append({
+            "Passengers": cell["passengers"],
+            "Time frame": cell["timeframe"],
+            "Technology": cell["tech_orient"],
+            "Architecture": architecture_label(cell["architecture"]),
+            "Best aircraft": f"Aircraft {best + 1}",
+            "TOPSIS Score": float(scores[best]),
+            **dict(zip(INPUTS_WITH_UNITS, matrix[best].tolist())),
+        })
+    return records
+
+
+def run_sweep(cells, weights, benefit, n_alternatives=1000, seed=0, electrif="Turboprop", max_workers=None):
+    """Score every cell of ``cells`` (see :func:`scenario_grid`), yielding the cumulative result per chunk.
+
+    The last yielded value holds every cell.
+    """
+    draws = base_draws(n_alternatives, seed)
+    weights = np.asarray(weights, dtype=np.float64)
+    benefit = np.asarray(benefit, dtype=bool)
+    result = SweepResult(n_cells=len(cells))
+    chunks = [cells[start:start + CHUNK_CELLS] for start in range(0, len(cells), CHUNK_CELLS)]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(draws, weights, benefit, electrif)) as pool:
+        futures = [pool.submit(_score_cells, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            result.records.extend(future.result())
+            yield result
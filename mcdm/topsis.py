@@ -0,0 +1,70 @@
+"""Vectorized TOPSIS.
+
+All functions work on a single contiguous ``(n_alternatives, n_criteria)``
+float matrix. Criteria directions are given as a boolean ``benefit`` mask
+(``True`` = maximize, ``False`` = minimize), weights as a 1-D array in the
+same column order.
+"""
+
+import numpy as np
+
+
+def as_matrix(values):
+    """Return ``values`` as a C-contiguous 2-D float64 array."""
+    matrix = np.ascontiguousarray(values, dtype=np.float64)
+    if matrix.ndim != 2:
+        raise ValueError(f"expected a 2-D decision matrix, got shape {matrix.shape}")
+    return matrix
+
+
+def benefit_mask(optimization, criteria):
+    """Build the boolean benefit mask from a ``{criterion: "max"|"min"}`` dict."""
+    return np.array([optimization[c] == "max" for c in criteria], dtype=bool)
+
+
+def column_norms(matrix):
+    """Euclidean norm of every column."""
+    return np.sqrt(np.einsum("ij,ij->j", matrix, matrix))
+
+
+def vector_normalize(matrix, norms=None):
+    """Divide every column by its Euclidean norm.
+
+    Columns with a zero norm are left untouched, as in the original page.
+    Returns the normalized matrix and the norms used.
+    """
+    matrix = as_matrix(matrix)
+    if norms is None:
+        norms = column_norms(matrix)
+    safe = np.where(norms != 0, norms, 1.0)
+    return matrix / safe, norms
+
+
+def ideal_points(weighted, benefit):
+    """Ideal and anti-ideal rows of a weighted normalized matrix."""
+    col_max = weighted.max(axis=0)
+    col_min = weighted.min(axis=0)
+    ideal = np.where(benefit, col_max, col_min)
+    anti_ideal = np.where(benefit, col_min, col_max)
+    return ideal, anti_ideal
+
+
+def closeness(weighted, ideal, anti_ideal):
+    """Relative closeness ``D- / (D+ + D-)`` of every row."""
+    d_plus = np.sqrt(((weighted - ideal) ** 2).sum(axis=1))
+    d_minus = np.sqrt(((weighted - anti_ideal) ** 2).sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return d_minus / (d_plus + d_minus)
+
+
+def score_normalized(normalized, weights, benefit):
+    """TOPSIS scores from an already vector-normalized matrix."""
+    weighted = normalized * np.asarray(weights, dtype=np.float64)
+    ideal, anti_ideal = ideal_points(weighted, benefit)
+    return closeness(weighted, ideal, anti_ideal)
+
+
+def topsis(matrix, weights, benefit):
+    """Full TOPSIS: normalize, weight, find the ideals and score every row."""
+    normalized, _ = vector_normalize(matrix)
+    return score_normalized(normalized, weights, benefit)
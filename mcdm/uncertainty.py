@@ -0,0 +1,214 @@
+"""Monte Carlo propagation of criteria uncertainty into TOPSIS rankings.
+
+Every criterion value is treated as uncertain: a realization multiplies it
+by ``1 + spread * z`` with ``z`` standard normal, independently for each
+alternative and criterion. The relative spread of each criterion is scaled
+by the technology confidence of the Tool page (``tech_orient``): aggressive
+technology assumptions are the least certain.
+
+Each realization is scored with TOPSIS from scratch (vector norms and ideal
+points move with the draws). Realizations are processed in batches of
+``(criteria, batch, n)`` float32 draws, one criterion at a time, so memory
+is bounded by ``ELEMENT_BUDGET`` whatever the number of samples. Chunks of
+realizations run in a process pool and return tallies only:
+
+* sum and sum of squares of every score (expected score, standard deviation);
+* how often every alternative is in the top N;
+* a per-alternative histogram of its scores, for the confidence bands.
+
+Histogram ranges come from a small pilot run (see :func:`score_ranges`).
+Each chunk has a fixed size and its own child of one ``SeedSequence``, so
+the totals do not depend on the number of workers.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import numpy as np
+
+# Relative standard deviation of each criterion (INPUTS_WITH_UNITS order) at
+# nominal confidence; notional values until the sizing-code scatter is known.
+CRITERION_SPREAD = np.array([0.02, 0.08, 0.05, 0.05, 0.06, 0.10])
+TECH_SPREAD_FACTORS = {"Conservative": 0.5, "Nominal": 1.0, "Aggressive": 2.0}
+
+ELEMENT_BUDGET = 4_000_000  # float32 draws held by one batch, per criterion
+CHUNK_SAMPLES = 50          # realizations per pool task
+PILOT_SAMPLES = 32
+HISTOGRAM_BINS = 64
+
+_worker_state = {}
+
+
+def criterion_spread(tech_orient="Nominal"):
+    """Relative spread of every criterion for a technology confidence level."""
+    return CRITERION_SPREAD * TECH_SPREAD_FACTORS[tech_orient]
+
+
+def sample_scores(matrix, weights, benefit, spread, n_samples, rng):
+    """``(n_samples, n)`` TOPSIS scores of perturbed realizations of ``matrix``.
+
+    Realizations come in antithetic pairs (draws ``z`` and ``-z``), which
+    halves the normal draws and lowers the variance of the averages. The
+    criteria are drawn and reduced one at a time in float32, so the peak
+    memory is a few ``(n_samples, n)`` arrays.
+    """
+    columns = np.ascontiguousarray(np.asarray(matrix, dtype=np.float32).T)
+    n = columns.shape[1]
+    weights = np.asarray(weights, dtype=np.float64) / np.sum(weights)
+    half = (n_samples + 1) // 2
+    values = np.empty((n_samples, n), dtype=np.float32)
+    diff = np.empty_like(values)
+    dist_best = np.zeros_like(values)
+    dist_worst = np.zeros_like(values)
+    for j, column in enumerate(columns):
+        # x * (1 + spread * z) = x + (spread * x) * z, clipped at zero
+        rng.standard_normal((half, n), dtype=np.float32, out=values[:half])
+        np.negative(values[:n_samples - half], out=values[half:])
+        values *= np.float32(spread[j]) * column
+        values += column
+        np.maximum(values, 0.0, out=values)
+        # Vector normalization and weighting of this criterion, per realization
+        norms = np.sqrt(np.einsum("sn,sn->s", values, values, dtype=np.float64))
+        norms[norms == 0] = 1.0
+        values *= (weights[j] / norms).astype(np.float32)[:, np.newaxis]
+        high, low = values.max(axis=1, keepdims=True), values.min(axis=1, keepdims=True)
+        best, worst = (high, low) if benefit[j] else (low, high)
+        for distance, target in ((dist_best, best), (dist_worst, worst)):
+            np.subtract(values, target, out=diff)
+            diff *= diff
+            distance += diff
+    np.sqrt(dist_best, out=dist_best)
+    np.sqrt(dist_worst, out=dist_worst)
+    dist_best += dist_worst
+    dist_best[dist_best == 0] = np.nan
+    return np.divide(dist_worst, dist_best, out=dist_worst)
+
+
+@dataclass
+class UncertaintyResult:
+    """Running tallies over the realizations scored so far."""
+
+    low: np.ndarray     # histogram range of every alternative
+    width: np.ndarray   # bin width of every alternative
+    top_n: int
+    n_samples: int = 0
+    score_sum: np.ndarray = None
+    score_sq_sum: np.ndarray = None
+    top_n_counts: np.ndarray = None
+    histogram: np.ndarray = None  # (n, HISTOGRAM_BINS)
+
+    def __post_init__(self):
+        n = self.low.shape[0]
+        if self.score_sum is None:
+            self.score_sum = np.zeros(n)
+        if self.score_sq_sum is None:
+            self.score_sq_sum = np.zeros(n)
+        if self.top_n_counts is None:
+            self.top_n_counts = np.zeros(n, dtype=np.int64)
+        if self.histogram is None:
+            self.histogram = np.zeros((n, HISTOGRAM_BINS), dtype=np.uint32)
+
+    def add_scores(self, scores):
+        """Tally a ``(samples, n)`` block of scores."""
+        samples, n = scores.shape
+        if np.isnan(scores).any():
+            scores = np.nan_to_num(scores)
+        self.n_samples += samples
+        self.score_sum += scores.sum(axis=0, dtype=np.float64)
+        self.score_sq_sum += np.einsum("sn,sn->n", scores, scores, dtype=np.float64)
+        top_n = min(self.top_n, n)
+        leaders = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n] if top_n < n else np.tile(np.arange(n), (samples, 1))
+        self.top_n_counts += np.bincount(leaders.ravel(), minlength=n)
+        position = scores - self.low.astype(np.float32)
+        position *= (1.0 / self.width).astype(np.float32)
+        np.clip(position, 0, HISTOGRAM_BINS - 1, out=position)
+        bins = position.astype(np.intp)
+        bins += np.arange(0, n * HISTOGRAM_BINS, HISTOGRAM_BINS)
+        self.histogram += np.bincount(bins.ravel(), minlength=n * HISTOGRAM_BINS).reshape(n, HISTOGRAM_BINS).astype(np.uint32)
+
+    def add(self, other):
+        self.n_samples += other.n_samples
+        self.score_sum += other.score_sum
+        self.score_sq_sum += other.score_sq_sum
+        self.top_n_counts += other.top_n_counts
+        self.histogram += other.histogram
+
+    @property
+    def mean(self):
+        return self.score_sum / max(self.n_samples, 1)
+
+    @property
+    def std(self):
+        variance = self.score_sq_sum / max(self.n_samples, 1) - self.mean ** 2
+        return np.sqrt(np.maximum(variance, 0.0))
+
+    @property
+    def p_top_n(self):
+        return self.top_n_counts / max(self.n_samples, 1)
+
+    def quantile(self, q, rows=None):
+        """Score quantile ``q`` of every alternative (or of ``rows``), interpolated within bins."""
+        rows = slice(None) if rows is None else rows
+        histogram = self.histogram[rows]
+        cumulative = histogram.cumsum(axis=1, dtype=np.int64)
+        target = q * cumulative[:, -1:]
+        k = np.minimum((cumulative < target).sum(axis=1, keepdims=True), HISTOGRAM_BINS - 1)
+        below = np.take_along_axis(cumulative, k, axis=1) - np.take_along_axis(histogram, k, axis=1)
+        inside = np.take_along_axis(histogram, k, axis=1)
+        fraction = np.where(inside > 0, (target - below) / np.maximum(inside, 1), 0.5)
+        return (self.low[rows] + (k[:, 0] + fraction[:, 0]) * self.width[rows])
+
+
+def score_ranges(matrix, weights, benefit, spread, seed, n_samples=PILOT_SAMPLES):
+    """Histogram ``(low, width)`` of every alternative from a pilot run.
+
+    The range spans the pilot scores padded by their own width on both
+    sides (about +-4 standard deviations); later scores outside it are
+    counted in the end bins.
+    """
+    pilot = sample_scores(matrix, weights, benefit, spread, n_samples, np.random.default_rng(seed))
+    pilot = np.nan_to_num(pilot)
+    low, high = pilot.min(axis=0).astype(np.float64), pilot.max(axis=0).astype(np.float64)
+    pad = np.maximum(high - low, 1e-4)
+    low = np.maximum(low - pad, 0.0)
+    high = np.minimum(high + pad, 1.0)
+    return low, (high - low) / HISTOGRAM_BINS
+
+
+def _init_worker(matrix, weights, benefit, spread, low, width):
+    _worker_state.update(matrix=matrix, weights=weights, benefit=benefit, spread=spread, low=low, width=width)
+
+
+def _run_chunk(n_samples, seed, top_n):
+    state = _worker_state
+    rng = np.random.default_rng(seed)
+    n = state["matrix"].shape[0]
+    batch = max(1, ELEMENT_BUDGET // max(n, 1))
+    result = UncertaintyResult(low=state["low"], width=state["width"], top_n=top_n)
+    for start in range(0, n_samples, batch):
+        size = min(batch, n_samples - start)
+        result.add_scores(sample_scores(state["matrix"], state["weights"], state["benefit"], state["spread"], size, rng))
+    # A chunk never holds more than 65535 samples: halves the data sent back
+    result.histogram = result.histogram.astype(np.uint16)
+    return result
+
+
+def run_uncertainty(matrix, weights, benefit, spread, n_samples=1000, top_n=10, seed=0, max_workers=None):
+    """Run the Monte Carlo analysis, yielding the cumulative result as each chunk finishes.
+
+    The last yielded value holds the complete tallies.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    benefit = np.asarray(benefit, dtype=bool)
+    full, rest = divmod(int(n_samples), CHUNK_SAMPLES)
+    sizes = [CHUNK_SAMPLES] * full + ([rest] if rest else [])
+    pilot_seed, *seeds = np.random.SeedSequence(seed).spawn(len(sizes) + 1)
+    low, width = score_ranges(matrix, weights, benefit, spread, pilot_seed)
+    total = UncertaintyResult(low=low, width=width, top_n=top_n)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(matrix, weights, benefit, spread, low, width)) as pool:
+        futures = [pool.submit(_run_chunk, size, child, top_n) for size, child in zip(sizes, seeds)]
+        for future in as_completed(futures):
+            total.add(future.result())
+            yield total
@@ -1,12 +1,30 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import random
 import plotly.express as px
 from datetime import datetime
 
+from mcdm.browser import RANK_COLUMN, SCORE_COLUMN, ResultsBrowser
+from mcdm.cache import cache_stats, cached_column_bounds, cached_column_index, cached_pareto_front
+from mcdm.criteria import INPUTS, INPUTS_WITH_UNITS, OPTIMIZATION
+from mcdm.loader import guess_columns, map_columns, read_header
+from mcdm.methods import PREFERENCES
+from mcdm.pareto import pareto_front
+from mcdm.pipeline import make_scenario, method_scores, normalize_weights, result_normalized, scenario_dataset, score_design_space, weight_vector
+from mcdm.ranking import Ranking, compare_rankings
+from mcdm.stability import share_to_raw, stability_intervals
+from mcdm.store import STORE, open_result
+from mcdm.surrogate import SURROGATES
+from mcdm.sweep import PASSENGER_OPTIONS, TIMEFRAME_OPTIONS, TECH_OPTIONS, run_sweep, scenario_grid
+from mcdm.topsis import benefit_mask
+from ui.diagnostics import diagnostics_panel, page_profiler
+from ui.filters import filter_summary, requirement_filters
+from ui.jobs import adopt_finished_analysis, analysis_job, job_status, submit_analysis, submit_upload
+from ui.results_browser import highlight_best_row, results_browser
+
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="TOPSIS Dashboard", page_icon="✈️", layout="wide")
+profiler = page_profiler("Tool")
+adopt_finished_analysis()
 
 # Deux colonnes : texte à gauche, logo à droite
 col1, col2 = st.columns([5, 1])
@@ -37,8 +55,43 @@ with col2:
 
 st.markdown("<hr style='margin-top:1rem; border: 1px solid #333;'>", unsafe_allow_html=True)
 
-# --- FIX Pandas Styler rendering limit for large DataFrames ---
-pd.set_option("styler.render.max_elements", 5_000_000)
+# --- DATA SOURCE ---
+st.header("Design Space")
+data_source = st.radio(
+    "Alternatives to rank",
+    ["Simulated aircraft", "Surrogate model (Latin hypercube)", "Sizing-tool export (CSV/Parquet)"],
+    horizontal=True,
+)
+uploaded_file = None
+column_map = {}
+if data_source == "Surrogate model (Latin hypercube)":
+    col_s1, col_s2, col_s3 = st.columns(3)
+    with col_s1:
+        surrogate_model = st.selectbox("Response surface", list(SURROGATES))
+    with col_s2:
+        n_designs = st.number_input("Designs to sample", min_value=1_000, max_value=5_000_000, value=100_000, step=10_000)
+    with col_s3:
+        refine_rounds = st.slider(
+            "Refinement rounds around the leaders", min_value=0, max_value=5, value=0,
+            help="Half of the designs are then sampled in shrinking boxes around the top-ranked designs (current weights).",
+        )
+elif data_source == "Sizing-tool export (CSV/Parquet)":
+    uploaded_file = st.file_uploader("Design space file", type=["csv", "parquet", "pq"])
+    if uploaded_file is not None:
+        header = read_header(uploaded_file)
+        guessed = guess_columns(header)
+        with st.expander("Column mapping", expanded=len(guessed) < len(INPUTS_WITH_UNITS)):
+            for i, criterion in enumerate(INPUTS_WITH_UNITS):
+                column = st.selectbox(
+                    criterion,
+                    header,
+                    index=header.index(guessed[criterion]) if criterion in guessed else None,
+                    key=f"column_{i}",
+                )
+                if column is not None:
+                    column_map[criterion] = column
+
+st.markdown("---")
 
 # --- GENERAL INPUTS ---
 st.header("Simulation Parameters")
@@ -49,39 +102,44 @@ n_alternatives = 1000  # fixed value instead of user input
 with col1:
     top_n = st.number_input("Top alternatives to display", min_value=1, max_value=n_alternatives, value=10)
 with col2:
-    electrif = st.selectbox("Propulsion Type - Unfunctional", ["Turboprop","Turbofan"])
+    electrif = st.selectbox("Propulsion Type", ["Turboprop","Turbofan"])
 with col3:
-    passengers = st.selectbox("Aircraft size (pax)", [8, 20, 50, 70, 100, 150, 210, 300])
+    passengers = st.selectbox("Aircraft size (pax)", PASSENGER_OPTIONS)
 with col4:
-    architecture = st.multiselect("Electric Architecture - Unfunctionnal", ["Hybrid", "Series Hybrid", "Parallel Hybrid", "Full Electric", "Turboelectric"])
+    architecture = st.multiselect("Electric Architecture", ["Hybrid", "Series Hybrid", "Parallel Hybrid", "Full Electric", "Turboelectric"])
 
-col5, col6 = st.columns(2)
+col5, col6, col7 = st.columns(3)
 with col5:
-    tech_orient = st.radio("Confidence in projecting technology assumptions - Unfunctional", ["Conservative", "Aggressive", "Nominal"])
+    tech_orient = st.radio(
+        "Confidence in projecting technology assumptions", ["Conservative", "Aggressive", "Nominal"],
+        help="Shifts the simulated criteria ranges and sets the criteria spread of the uncertainty analysis (Visualizations page).",
+    )
 with col6:
-    timeframe = st.radio("Time frame desired - Unfunctional", ["2035", "2045", "2055"])
+    timeframe = st.radio("Time frame desired", ["2035", "2045", "2055"])
+with col7:
+    seed = st.number_input("Random seed", min_value=0, value=0, step=1)
 
 st.markdown("---")
 
 
+def stability_caption(interval, raw_values, k, labels):
+    """One line under a slider: stable weight range and the swaps at its ends."""
+    j = interval.criterion
+    slider_low = share_to_raw(interval.low, raw_values, j)
+    slider_high = min(share_to_raw(interval.high, raw_values, j), 5)
+    text = (f"Top-{k} order unchanged for {interval.low:.0%}–{interval.high:.0%} of the weight "
+            f"(slider {slider_low:.1f}–{slider_high:.1f})")
+    swaps = []
+    if interval.low_pair is not None:
+        swaps.append(f"below: {labels[interval.low_pair[0]]} passes {labels[interval.low_pair[1]]}")
+    if interval.high_pair is not None:
+        swaps.append(f"above: {labels[interval.high_pair[0]]} passes {labels[interval.high_pair[1]]}")
+    return text + (f"; {', '.join(swaps)}" if swaps else "")
+
+
 # --- CRITERIA ---
-inputs_with_units = [
-    "Aircraft Cruise Speed (knots)",
-    "Total Energy Required (MJ)",
-    "Direct operating cost plus interest ($/mile)",
-    "Required yield per revenue passenger mile ($/mile)",
-    "Acquisition price with spares ($M)",
-    "NOx Emission (g/kg of fuel)"
-]
-
-inputs = [
-    "Aircraft Cruise Speed",
-    "Total Energy Required",
-    "Direct operating cost plus interest",
-    "Required yield per revenue passenger mile",
-    "Acquisition price with spares",
-    "NOx Emission"
-]
+inputs_with_units = INPUTS_WITH_UNITS
+inputs = INPUTS
 
 st.header("Criteria Weights")
 
@@ -90,6 +148,8 @@ col_inputs, col_chart = st.columns([3, 2])
 
 with col_inputs:
     weights = {}
+    # Filled with the stability interval of each weight once a ranking exists (if shown)
+    stability_slots = {}
     for inp in inputs:
         weight_value = st.slider(
             f"Weight: {inp}",
@@ -100,11 +160,29 @@ with col_inputs:
             key=f"weight_{inp}"
         )
         weights[inp] = weight_value
+        stability_slots[inp] = st.empty()
+
+    # Off by default: the crossing points cost a pass over every alternative
+    # per criterion (about a second on a million rows) on each weight change
+    show_stability = st.toggle(
+        "Show weight stability",
+        value=False,
+        help="Under each slider: the weight range over which the current top-k order stays the same, the other sliders fixed.",
+    )
+    stability_k = st.number_input(
+        "Top-k order to keep stable",
+        min_value=1,
+        max_value=10,
+        value=3,
+        disabled=not show_stability,
+    )
 
     # Normalisation
-    total_raw_weight = sum(weights.values())
-    normalized_weights = {k: v / total_raw_weight for k, v in weights.items()}
-    weights = normalized_weights
+    if sum(weights.values()) == 0:
+        st.error("At least one criterion needs a weight above 0.")
+        st.stop()
+    raw_weights = weights
+    weights = normalize_weights(weights)
 
 with col_chart:
     st.markdown("<h3 style='text-align: center;'>Weight Distribution</h3>", unsafe_allow_html=True)
@@ -150,114 +228,294 @@ with col_chart:
     st.plotly_chart(fig, use_container_width=True)
 
 # --- DEFINE OPTIMIZATION TYPE (MAX/MIN) ---
-optimization = {
-    inputs_with_units[0]: "max",
-    inputs_with_units[1]: "min",
-    inputs_with_units[2]: "min",
-    inputs_with_units[3]: "min",
-    inputs_with_units[4]: "min",
-    inputs_with_units[5]: "min"
-}
+optimization = OPTIMIZATION
 
 st.markdown("---")
 
 # --- RUN TOPSIS ANALYSIS ---
+# The button starts a background job that builds the dataset and fills the
+# caches; the page stays responsive and keeps showing the previous results.
+# Once the job is done it pins the scenario, and the ranking below is then
+# refreshed on every rerun from the cached dataset and normalized matrix, so
+# moving a weight slider only re-runs the scoring step.
+pareto_only = st.toggle(
+    "Rank the Pareto front only (non-dominated alternatives)",
+    help="Drops every aircraft that another one beats or equals on all six criteria before scoring and display.",
+)
+
 if st.button("🚀 Run TOPSIS Analysis"):
-    # --- SIMULATED DATA ---
-    data = {"Case": [f"Aircraft {i+1}" for i in range(n_alternatives)]}
-    for i, criterion in enumerate(inputs_with_units):
-        if i == 0:
-            data[criterion] = [random.randint(210, 250) for _ in range(n_alternatives)]
-        elif i == 1:
-            data[criterion] = [round(random.uniform(3, 7), 3) for _ in range(n_alternatives)]
-        elif i == 2:
-            data[criterion] = [round(random.uniform(6.4, 8.7), 3) for _ in range(n_alternatives)]
-        elif i == 3:
-            data[criterion] = [round(random.uniform(1.35, 1.5), 3) for _ in range(n_alternatives)]
-        elif i == 4:
-            data[criterion] = [round(random.uniform(220, 270), 3) for _ in range(n_alternatives)]
-        elif i == 5:
-            data[criterion] = [random.randint(27032, 31032) for _ in range(n_alternatives)]
-
-    df = pd.DataFrame(data)
-
-    st.subheader(f"Simulated Aircraft Data ({n_alternatives} alternatives, {passengers} passengers)")
-    st.dataframe(df, use_container_width=True, hide_index=True)
-
-    # --- NORMALIZATION ---
-    df_norm = df.copy()
-    for inp in inputs_with_units:
-        norm = np.linalg.norm(df[inp])
-        df_norm[inp] = df[inp] / norm if norm != 0 else df[inp]
-
-    # --- APPLY WEIGHTS ---
-    df_weighted = df_norm.copy()
-    for inp, weight_inp in zip(inputs_with_units, inputs):
-        df_weighted[inp] *= weights[weight_inp]
-
-    # --- IDEAL / ANTI-IDEAL SOLUTIONS ---
-    ideal = {inp: df_weighted[inp].max() if optimization[inp] == "max" else df_weighted[inp].min() for inp in inputs_with_units}
-    anti_ideal = {inp: df_weighted[inp].min() if optimization[inp] == "max" else df_weighted[inp].max() for inp in inputs_with_units}
-
-    # --- DISTANCES & TOPSIS SCORES ---
-    D_plus, D_minus = [], []
-    for i in range(n_alternatives):
-        d_plus = np.sqrt(sum((df_weighted.loc[i, inp] - ideal[inp]) ** 2 for inp in inputs_with_units))
-        d_minus = np.sqrt(sum((df_weighted.loc[i, inp] - anti_ideal[inp]) ** 2 for inp in inputs_with_units))
-        D_plus.append(d_plus)
-        D_minus.append(d_minus)
-
-    df["TOPSIS Score"] = [d_minus / (d_plus + d_minus) for d_plus, d_minus in zip(D_plus, D_minus)]
-    df_sorted = df.sort_values(by="TOPSIS Score", ascending=False).reset_index(drop=True)
-    topN = df_sorted.head(int(top_n))
-
-    # --- HIGHLIGHT BEST ---
-    def highlight_best_row(row):
-        color = "background-color: #3CB371; color: white" if row.name == 0 else ""
-        return [color] * len(row)
+    new_scenario = None
+    if data_source == "Simulated aircraft":
+        new_scenario = make_scenario(
+            n_alternatives=n_alternatives,
+            passengers=passengers,
+            timeframe=timeframe,
+            tech_orient=tech_orient,
+            architecture=architecture,
+            electrif=electrif,
+            seed=int(seed),
+        )
+    elif data_source == "Surrogate model (Latin hypercube)":
+        new_scenario = {
+            **make_scenario(
+                n_alternatives=int(n_designs),
+                passengers=passengers,
+                timeframe=timeframe,
+                tech_orient=tech_orient,
+                architecture=architecture,
+                electrif=electrif,
+                seed=int(seed),
+            ),
+            "surrogate": surrogate_model,
+            "rounds": refine_rounds,
+        }
+        if refine_rounds:
+            # Refinement targets the leaders under the weights of this run
+            new_scenario["weights"] = tuple(weights.items())
+    elif uploaded_file is None:
+        st.error("Upload a CSV or Parquet file first.")
+    else:
+        # Converted once to the columnar cache by the job; reruns memory-map the copy
+        try:
+            map_columns(header, column_map)
+            submit_upload(uploaded_file, column_map, weights, pareto_only, top_n)
+        except ValueError as exc:
+            st.error(f"Cannot load {uploaded_file.name}: {exc}")
+    if new_scenario is not None:
+        submit_analysis(new_scenario, weights, pareto_only, top_n)
+
+job_status()
+
+if 'scenario' in st.session_state:
+    scenario = st.session_state['scenario']
+    with profiler.stage("dataset"):
+        df, dataset_matrix, dataset_hash = scenario_dataset(scenario)
+    n_total = len(df)
+    benefit = benefit_mask(optimization, inputs_with_units)
+
+    # --- REQUIREMENT FILTERS (sorted column indexes, built on the first requirement) ---
+    requirements = requirement_filters(
+        cached_column_bounds(dataset_hash, dataset_matrix), inputs_with_units, key=f"requirements_{dataset_hash[:12]}",
+    )
+    feasible = None
+    if requirements:
+        with profiler.stage("filter"):
+            feasible = cached_column_index(dataset_hash, dataset_matrix).query(requirements)
+        filter_summary(feasible, n_total, inputs_with_units)
+        if len(feasible.rows) == 0:
+            st.warning("No aircraft meets all the requirements; widen the filters.")
+            st.stop()
+    n_space = n_total if feasible is None else len(feasible.rows)
+
+    # The survivors have no cache key (every slider move gives a new set):
+    # they are scored from scratch and only named for the session caches
+    if feasible is None:
+        data_hash = f"{dataset_hash}:pareto" if pareto_only else dataset_hash
+        view = data_hash
+    else:
+        data_hash = None
+        view = f"{dataset_hash}:requirements:{sorted(requirements.items())!r}" + (":pareto" if pareto_only else "")
+
+    # One copy of the dataset per process (mcdm.store); the session keeps a
+    # handle with its rows, scores and ranking
+    result = st.session_state.get('result')
+    if result is None or result.view != view:
+        # --- PARETO FRONT (optional, of the survivors of the filters) ---
+        # The shared dataset is never restricted by copy: the handle ranks a
+        # selection of its rows (None: all of them)
+        rows = None if feasible is None else feasible.rows
+        if pareto_only:
+            with profiler.stage("pareto"):
+                if feasible is None:
+                    rows = cached_pareto_front(dataset_hash, dataset_matrix, benefit)
+                else:
+                    rows = rows[pareto_front(dataset_matrix[rows], benefit)]
+        result = open_result(dataset_hash, df, dataset_matrix, rows, data_hash, view)
+    if pareto_only:
+        st.info(f"Pareto front: {result.n_rows:,} of {n_space:,} alternatives are non-dominated ({result.n_rows / n_space:.1%}).")
+
+    with profiler.stage("normalize"):
+        normalized = result_normalized(result)
+
+    # --- TOPSIS SCORES (weighting, ideals, distances on the normalized matrix) ---
+    with profiler.stage("score"):
+        if result.scores is not None and result.weights == weights:
+            scores = result.scores
+        else:
+            scores = score_design_space(result.matrix, weights, normalized=normalized, data_hash=data_hash)
+    # Partial top-N selection; the full order is only built if a page asks for it
+    with profiler.stage("rank"):
+        ranking = Ranking(scores, labels=result.labels, top_n=max(int(top_n), 10))
+        topN = result.take(ranking.top(int(top_n))).reset_index().assign(**{"TOPSIS Score": scores[ranking.top(int(top_n))]})
+        topN.insert(0, RANK_COLUMN, range(1, len(topN) + 1))
+
+    # --- WEIGHT STABILITY (exact crossing points, shown under the sliders on demand) ---
+    if show_stability:
+        stability_k = min(int(stability_k), result.n_rows)
+        stability_key = (view, tuple(weights.items()), stability_k)
+        cached_key, intervals = st.session_state.get('stability', (None, None))
+        if cached_key != stability_key:
+            with profiler.stage("stability"):
+                intervals = stability_intervals(normalized, weight_vector(weights), benefit, ranking.top(stability_k))
+            st.session_state['stability'] = (stability_key, intervals)
+        raw_values = [raw_weights[inp] for inp in inputs]
+        for inp, interval in zip(inputs, intervals):
+            stability_slots[inp].caption(stability_caption(interval, raw_values, stability_k, result.labels))
+
+    # --- SIMULATED DATA (paginated, only the visible page is sent to the browser) ---
+    browser_hash, browser = st.session_state.get('results_browser', (None, None))
+    if browser_hash != view:
+        browser = ResultsBrowser(result.frame, ranking, selection=result.rows)
+        st.session_state['results_browser'] = (view, browser)
+    browser.set_ranking(ranking)
+
+    if "source" in scenario:
+        st.subheader(f"Sizing-Tool Data ({result.n_rows} alternatives, {scenario['name']})")
+    elif "surrogate" in scenario:
+        st.subheader(f"Surrogate-Sampled Aircraft Data ({result.n_rows} alternatives, {scenario['passengers']} passengers)")
+    else:
+        st.subheader(f"Simulated Aircraft Data ({result.n_rows} alternatives, {scenario['passengers']} passengers)")
+    with profiler.stage("results table"):
+        results_browser(browser, inputs_with_units + [SCORE_COLUMN])
 
     st.markdown("---")
-    st.session_state['initial_data'] = df.set_index('Case')
-    st.session_state['topsis_results'] = df_sorted.set_index('Case')
-    st.session_state['weights'] = weights
+    st.session_state['result'] = result.set_result(scores, ranking, weights)
 
     st.subheader(f"TOPSIS Ranking (Top {int(top_n)} Aircraft)")
-    st.dataframe(topN.style.apply(highlight_best_row, axis=1), use_container_width=True)
+    with profiler.stage("top-N table"):
+        st.dataframe(topN.style.apply(highlight_best_row, axis=1), use_container_width=True, hide_index=True)
 
     # --- VISUALIZATION ---
     st.markdown(f"### Top {int(top_n)} Aircraft - TOPSIS Scores")
-    fig = px.bar(
-        topN.sort_values(by="TOPSIS Score", ascending=False),
-        x="Case",
-        y="TOPSIS Score",
-        text="TOPSIS Score",
-        color="TOPSIS Score",
-        color_continuous_scale=px.colors.sequential.Tealgrn,
-    )
-    fig.update_traces(
-        texttemplate="%{text:.3f}",
-        textposition="outside",
-        hovertemplate="<b>%{x}</b><br>TOPSIS Score: %{y:.4f}<extra></extra>"
-    )
-    fig.update_layout(
-        xaxis=dict(categoryorder="array", categoryarray=topN["Case"]),
-        yaxis_title="Score",
-        xaxis_title="Aircraft Case",
-        height=450,
-        coloraxis_showscale=False,
-        plot_bgcolor="rgba(0,0,0,0)",
-        paper_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="white", size=13),
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    with profiler.stage("score chart"):
+        fig = px.bar(
+            topN,
+            x="Case",
+            y="TOPSIS Score",
+            text="TOPSIS Score",
+            color="TOPSIS Score",
+            color_continuous_scale=px.colors.sequential.Tealgrn,
+        )
+        fig.update_traces(
+            texttemplate="%{text:.3f}",
+            textposition="outside",
+            hovertemplate="<b>%{x}</b><br>TOPSIS Score: %{y:.4f}<extra></extra>"
+        )
+        fig.update_layout(
+            xaxis=dict(categoryorder="array", categoryarray=topN["Case"]),
+            yaxis_title="Score",
+            xaxis_title="Aircraft Case",
+            height=450,
+            coloraxis_showscale=False,
+            plot_bgcolor="rgba(0,0,0,0)",
+            paper_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="white", size=13),
+        )
+        st.plotly_chart(fig, use_container_width=True)
 
     best_alt = topN.iloc[0]["Case"]
     best_score = topN.iloc[0]["TOPSIS Score"]
     st.success(f"✅ **Best aircraft configuration:** {best_alt} — TOPSIS Score: {best_score:.4f}")
 
-else:
+    # --- METHOD COMPARISON (TOPSIS stays the reference ranking) ---
+    st.markdown("---")
+    st.subheader("Cross-Check with Other Methods")
+    col_methods, col_preference = st.columns([2, 1])
+    with col_methods:
+        methods = st.multiselect("Methods", ["VIKOR", "PROMETHEE II"], default=["VIKOR", "PROMETHEE II"])
+    with col_preference:
+        preference = st.selectbox(
+            "PROMETHEE preference function", PREFERENCES, index=PREFERENCES.index("linear"),
+            help="Usual and linear are computed exactly in O(n log n); gaussian needs every pair of alternatives (O(n²)).",
+        )
+    if preference == "gaussian" and "PROMETHEE II" in methods and result.n_rows > 20_000:
+        st.warning(f"The gaussian preference compares all {result.n_rows:,}² pairs of alternatives and may take several minutes.")
+
+    comparison_key = (view, tuple(weights.items()), tuple(methods), preference, int(top_n))
+    if st.button("⚖️ Compare methods") and methods:
+        with profiler.stage("method comparison"):
+            rankings = {"TOPSIS": ranking}
+            for method in methods:
+                options = {"preference": preference} if method == "PROMETHEE II" else {}
+                rankings[method] = Ranking(method_scores(result.matrix, weights, method, **options), labels=result.labels, top_n=int(top_n))
+            st.session_state['method_comparison'] = (comparison_key, compare_rankings(rankings, int(top_n)))
+
+    cached_key, comparison = st.session_state.get('method_comparison', (None, None))
+    if cached_key == comparison_key:
+        rank_table, agreement = comparison
+        st.dataframe(rank_table.rename_axis("Case"), use_container_width=True)
+        st.dataframe(agreement.style.format({agreement.columns[1]: "{:.3f}", agreement.columns[2]: "{:.0%}"}),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.caption(f"Ranks of every aircraft in the top {int(top_n)} of at least one method, side by side with TOPSIS.")
+
+    with st.expander("Cache statistics"):
+        st.dataframe(pd.DataFrame(cache_stats() + [STORE.stats()]), use_container_width=True, hide_index=True)
+
+elif analysis_job() is None or analysis_job().finished:
     st.info("Click **🚀 Run TOPSIS Analysis** to generate simulated aircraft data and compute the ranking.")
 
+# --- SCENARIO SWEEP (every size x time frame x technology x architecture) ---
+st.markdown("---")
+st.subheader("Scenario Sweep")
+st.write(
+    "Simulates and ranks every combination of aircraft size, time frame, technology confidence and electric "
+    "architecture under the current weights, propulsion type and seed. Scores are relative to the design space "
+    "of each combination."
+)
+
+sweep_cells = scenario_grid()
+sweep_key = (tuple(weights.items()), electrif, int(seed), n_alternatives)
+sweep_progress = st.empty()
+sweep_slot = st.empty()
+
+
+def show_sweep(sweep):
+    frame = sweep.frame()
+    frame["Time frame / technology"] = frame["Time frame"] + " " + frame["Technology"]
+    with sweep_slot.container():
+        fig = px.density_heatmap(
+            frame,
+            x="Time frame / technology",
+            y=frame["Passengers"].astype(str),
+            z="TOPSIS Score",
+            histfunc="max",
+            facet_col="Architecture",
+            facet_col_wrap=3,
+            category_orders={
+                "Time frame / technology": [f"{t} {o}" for t in TIMEFRAME_OPTIONS for o in TECH_OPTIONS],
+                "y": [str(p) for p in PASSENGER_OPTIONS],
+            },
+            color_continuous_scale=px.colors.sequential.Tealgrn,
+            labels={"y": "Passengers"},
+        )
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+        fig.update_layout(height=600, paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)",
+                          title=f"Best TOPSIS score per scenario ({sweep.n_done} / {sweep.n_cells})")
+        st.plotly_chart(fig, use_container_width=True, key=f"sweep_heatmap_{sweep.n_done}")
+        st.dataframe(frame.drop(columns="Time frame / technology").sort_values("TOPSIS Score", ascending=False),
+                     use_container_width=True, hide_index=True)
+
+
+if st.button(f"🗺️ Sweep all {len(sweep_cells)} scenarios"):
+    with profiler.stage("scenario sweep"):
+        progress_bar = sweep_progress.progress(0.0, text="Scoring scenarios...")
+        for sweep in run_sweep(
+            sweep_cells,
+            weight_vector(weights),
+            benefit_mask(optimization, inputs_with_units),
+            n_alternatives=n_alternatives,
+            seed=int(seed),
+            electrif=electrif,
+        ):
+            progress_bar.progress(sweep.n_done / sweep.n_cells, text=f"{sweep.n_done} / {sweep.n_cells} scenarios")
+            show_sweep(sweep)
+    st.session_state['sweep'] = (sweep_key, sweep)
+elif st.session_state.get('sweep', (None,))[0] == sweep_key:
+    show_sweep(st.session_state['sweep'][1])
+
+diagnostics_panel(profiler)
+
 st.markdown("---")
 # --- FOOTER SECTION WITH LOGO ---
 col_footer_left, col_footer_right = st.columns([4, 1])
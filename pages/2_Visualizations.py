@@ -1,12 +1,25 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
+import plotly.graph_objects as go
 from datetime import datetime
 
+from mcdm.cache import cached_grid_codes
+from mcdm.criteria import INPUTS, INPUTS_WITH_UNITS, OPTIMIZATION
+from mcdm.downsample import DEFAULT_POINT_BUDGET, downsample, grid_codes
+from mcdm.pipeline import result_normalized
+from mcdm.sensitivity import run_sensitivity
+from mcdm.uncertainty import TECH_SPREAD_FACTORS, criterion_spread, run_uncertainty
+from mcdm.topsis import benefit_mask
+from ui.comparison import comparison_table, criteria_bars
+from ui.design_space import parallel_coordinates, scatter_matrix
+from ui.diagnostics import diagnostics_panel, page_profiler
+from ui.jobs import adopt_finished_analysis, job_status
+
 # --- PAGE CONFIGURATION ---
 st.set_page_config(page_title="Visualizations", page_icon="📈", layout="wide")
+profiler = page_profiler("Visualizations")
+adopt_finished_analysis()
 
 # --- HEADER SECTION ---
 col1, col2 = st.columns([5, 1])
@@ -38,174 +51,356 @@ with col2:
 st.markdown("<hr style='margin-top:1rem; border: 1px solid #333;'>", unsafe_allow_html=True)
 
 
-# --- LOAD DATA FROM MAIN PAGE ---
-if 'initial_data' in st.session_state and 'weights' in st.session_state and 'topsis_results' in st.session_state:
-    initial_data = st.session_state.initial_data
-    weights = st.session_state.weights
-    results = st.session_state.topsis_results
+# --- LOAD DATA FROM MAIN PAGE (an analysis started there may still be running) ---
+job_status()
+if 'result' in st.session_state:
+    # Handle on the dataset shared by all sessions (mcdm.store) plus this session's
+    # rows, scores and ranking; positions below are positions in the scores
+    result_handle = st.session_state.result
+    # Cache key of the ranked rows (None for the survivors of requirement
+    # filters, which only the session caches below tell apart: view)
+    data_hash = result_handle.data_hash
+    view = result_handle.view
+    weights = result_handle.weights
+    ranking = result_handle.ranking
 
-    # --- REMOVE TOPSIS SCORE COLUMN ---
-    if "TOPSIS Score" in initial_data.columns:
-        initial_data = initial_data.drop(columns=["TOPSIS Score"])
+    # --- CRITERIA ---
+    criteria = result_handle.criteria
 
     # --- MAIN SECTION ---
     st.header("Aircraft Characteristics")
-    if isinstance(initial_data, pd.DataFrame):
+    if ranking is not None:
         # Get top 10 ranked aircraft
-        top_alternatives = results.index[:10].tolist()
+        top_alternatives = ranking.top_labels(10)
+        top_rows = dict(zip(top_alternatives, ranking.top(10)))
 
         # Select which to compare
         selected_alternatives = st.multiselect(
             "Select aircraft to compare:",
             options=top_alternatives,
             default=top_alternatives[:3],
-            format_func=lambda x: f"{x} (TOPSIS Rank: {results.index.get_loc(x)+1})"
+            format_func=lambda x: f"{x} (TOPSIS Rank: {ranking.rank_of(x)})"
         )
 
-        if selected_alternatives:
-            # --- CRITERIA ---
-            criteria = initial_data.columns.tolist()
-
-            # --- NORMALIZE DATA FOR RADAR ---
-            normalized = initial_data.copy().astype(float)
-            for col in criteria:
-                min_val, max_val = normalized[col].min(), normalized[col].max()
-                if max_val > min_val:
-                    normalized[col] = (normalized[col] - min_val) / (max_val - min_val)
-                else:
-                    normalized[col] = 0.5  # constant if no variation
+        # --- NORMALIZE DATA FOR RADAR ---
+        # Normalized values and value labels of the selectable aircraft, computed
+        # once per result set; changing the selection only rebuilds the figure.
+        radar_key = (view, tuple(top_alternatives))
+        if st.session_state.get('radar_table', (None,))[0] != radar_key:
+            with profiler.stage("radar normalize"):
+                top_frame = result_handle.take(ranking.top(10))
+                st.session_state['radar_table'] = (radar_key, comparison_table(
+                    top_frame, range(len(top_frame)), criteria, bounds=result_handle.bounds(),
+                ))
+        normalized, real_text = st.session_state['radar_table'][1]
 
+        if selected_alternatives:
             # --- RADAR CHART ---
-            fig_radar = go.Figure()
-
-            for alt in selected_alternatives:
-                r = normalized.loc[alt].tolist()
-                r_closed = r + [r[0]]
+            with profiler.stage("radar chart"):
+                fig_radar = go.Figure()
                 theta_closed = criteria + [criteria[0]]
 
-                real_values = [initial_data.loc[alt, c] for c in criteria]
-                real_text = []
-                for v in real_values:
-                    if isinstance(v, (int, np.integer)):
-                        real_text.append(f"{int(v):,}")
-                    elif isinstance(v, (float, np.floating)):
-                        if abs(v) >= 1000:
-                            real_text.append(f"{v:,.0f}")
-                        elif abs(v) >= 1:
-                            real_text.append(f"{v:.2f}")
-                        else:
-                            real_text.append(f"{v:.3f}")
-                    else:
-                        real_text.append(str(v))
-
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=r_closed,
-                    theta=theta_closed,
-                    fill='toself',
-                    name=f"{alt} (Rank {results.index.get_loc(alt)+1})",
-                    mode='lines+markers',
-                    marker=dict(size=8),
-                    line=dict(width=2),
-                    hovertemplate='Criterion: %{theta}<br>Normalized: %{r:.3f}<br>Actual value: %{text}<extra></extra>',
-                    text=real_text + [real_text[0]]
-                ))
+                for alt in selected_alternatives:
+                    r = normalized.loc[alt].tolist()
+                    text = real_text.loc[alt].tolist()
+                    fig_radar.add_trace(go.Scatterpolar(
+                        r=r + [r[0]],
+                        theta=theta_closed,
+                        fill='toself',
+                        name=f"{alt} (Rank {ranking.rank_of(alt)})",
+                        mode='lines+markers',
+                        marker=dict(size=8),
+                        line=dict(width=2),
+                        hovertemplate='Criterion: %{theta}<br>Normalized: %{r:.3f}<br>Actual value: %{text}<extra></extra>',
+                        text=text + [text[0]]
+                    ))
 
-            # --- SINGLE SET OF VALUE LABELS (no duplicates) ---
-            for alt in selected_alternatives:
-                r = normalized.loc[alt].tolist()
-                theta = criteria
-                real_values = [initial_data.loc[alt, c] for c in criteria]
-                real_text = []
-                for v in real_values:
-                    if isinstance(v, (int, np.integer)):
-                        real_text.append(f"{int(v):,}")
-                    elif isinstance(v, (float, np.floating)):
-                        if abs(v) >= 1000:
-                            real_text.append(f"{v:,.0f}")
-                        elif abs(v) >= 1:
-                            real_text.append(f"{v:.2f}")
-                        else:
-                            real_text.append(f"{v:.3f}")
-                    else:
-                        real_text.append(str(v))
-
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=r,
-                    theta=theta,
-                    mode='text',
-                    text=real_text,
-                    textposition='top center',
-                    textfont=dict(color='rgba(255, 80, 80, 0.9)', size=10, family="Arial Bold"),
-                    showlegend=False,
-                    hoverinfo='skip',
-                ))
+                # --- SINGLE SET OF VALUE LABELS (no duplicates) ---
+                for alt in selected_alternatives:
+                    fig_radar.add_trace(go.Scatterpolar(
+                        r=normalized.loc[alt].tolist(),
+                        theta=criteria,
+                        mode='text',
+                        text=real_text.loc[alt].tolist(),
+                        textposition='top center',
+                        textfont=dict(color='rgba(255, 80, 80, 0.9)', size=10, family="Arial Bold"),
+                        showlegend=False,
+                        hoverinfo='skip',
+                    ))
 
-            # --- STYLE LAYOUT ---
-            fig_radar.update_layout(
-                polar=dict(
-                    bgcolor="rgba(40, 60, 80, 0.25)",
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, 1],
-                        tickvals=[0, 0.25, 0.5, 0.75, 1.0],
-                        ticktext=["0", "25%", "50%", "75%", "100%"],
-                        tickfont=dict(size=12, color="rgba(230,230,230,0.9)"),
-                        gridcolor="rgba(200,200,200,0.2)",
-                        linecolor="rgba(200,200,200,0.3)",
-                        layer="below traces"
+                # --- STYLE LAYOUT ---
+                fig_radar.update_layout(
+                    polar=dict(
+                        bgcolor="rgba(40, 60, 80, 0.25)",
+                        radialaxis=dict(
+                            visible=True,
+                            range=[0, 1],
+                            tickvals=[0, 0.25, 0.5, 0.75, 1.0],
+                            ticktext=["0", "25%", "50%", "75%", "100%"],
+                            tickfont=dict(size=12, color="rgba(230,230,230,0.9)"),
+                            gridcolor="rgba(200,200,200,0.2)",
+                            linecolor="rgba(200,200,200,0.3)",
+                            layer="below traces"
+                        ),
+                        angularaxis=dict(
+                            direction="clockwise",
+                            tickfont=dict(size=13, color="white"),
+                            gridcolor="rgba(200,200,200,0.2)"
+                        ),
                     ),
-                    angularaxis=dict(
-                        direction="clockwise",
-                        tickfont=dict(size=13, color="white"),
-                        gridcolor="rgba(200,200,200,0.2)"
+                    showlegend=True,
+                    legend=dict(
+                        orientation='h',
+                        yanchor='bottom',
+                        y=-0.25,
+                        xanchor='center',
+                        x=0.5,
+                        font=dict(size=13)
                     ),
-                ),
-                showlegend=True,
-                legend=dict(
-                    orientation='h',
-                    yanchor='bottom',
-                    y=-0.25,
-                    xanchor='center',
-                    x=0.5,
-                    font=dict(size=13)
-                ),
-                title=dict(
-                    text="Overview of Aircraft Characteristics",
-                    font=dict(size=20, color="white"),
-                    x=0.5,
-                    xanchor='center'
-                ),
-                margin=dict(t=100, b=100, l=100, r=100),
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                height=850,
-            )
+                    title=dict(
+                        text="Overview of Aircraft Characteristics",
+                        font=dict(size=20, color="white"),
+                        x=0.5,
+                        xanchor='center'
+                    ),
+                    margin=dict(t=100, b=100, l=100, r=100),
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    height=850,
+                )
 
-            st.plotly_chart(fig_radar, use_container_width=True)
+                st.plotly_chart(fig_radar, use_container_width=True)
 
     # --- DETAILED ANALYSIS ---
     st.markdown("---")
     st.subheader("Detailed Criterion Analysis")
-    for criterion in criteria:
-        fig_detail = px.bar(
-            initial_data.loc[selected_alternatives],
-            y=criterion,
-            title=f"Comparison for {criterion}",
-            color_discrete_sequence=['teal'],
-        )
-        fig_detail.update_layout(
-            xaxis_title="Aircraft",
-            yaxis_title=criterion
-        )
-        fig_detail.update_traces(
-            text=[f"TOPSIS Rank: {results.index.get_loc(alt)+1}" for alt in selected_alternatives],
-            textposition='auto',
-        )
-        st.plotly_chart(fig_detail, use_container_width=True)
+    if selected_alternatives:
+        with profiler.stage("detail charts"):
+            selected_rows = result_handle.take([top_rows[alt] for alt in selected_alternatives])
+            fig_detail = criteria_bars(selected_rows, criteria, ranking.rank_of)
+            st.plotly_chart(fig_detail, use_container_width=True)
+
+    # --- FULL DESIGN SPACE ---
+    st.markdown("---")
+    st.subheader("Full Design Space")
+    st.write(
+        "Where the whole design space sits relative to the leaders. Above the point budget the space is binned on a "
+        "regular grid and every occupied cell is drawn as its best-scoring aircraft; the top 10 are always drawn."
+    )
+    point_budget = int(st.number_input("Point budget", min_value=500, max_value=100_000, value=DEFAULT_POINT_BUDGET, step=500))
+
+    with profiler.stage("downsample"):
+        scores = result_handle.scores
+        leaders = ranking.top(10)
+        codes = None
+        if len(scores) > point_budget:
+            budget = point_budget - len(leaders)
+            if data_hash is not None:
+                codes = cached_grid_codes(data_hash, result_handle.matrix, budget)
+            else:
+                codes_key, codes = st.session_state.get('grid_codes', (None, None))
+                if codes_key != (view, budget):
+                    codes = grid_codes(result_handle.matrix, budget)
+                    st.session_state['grid_codes'] = ((view, budget), codes)
+        rows, counts = downsample(None, scores, point_budget, keep=leaders, codes=codes)
+        points = result_handle.take(rows)
+        point_scores = scores[rows]
+        is_leader = np.isin(rows, leaders)
+    if len(rows) < len(scores):
+        st.caption(f"{len(rows):,} points drawn for {len(scores):,} alternatives.")
+
+    short_labels = [INPUTS[INPUTS_WITH_UNITS.index(c)] if c in INPUTS_WITH_UNITS else c for c in criteria]
+    tab_splom, tab_parcoords = st.tabs(["Scatter matrix", "Parallel coordinates"])
+    with tab_splom:
+        with profiler.stage("scatter matrix"):
+            st.plotly_chart(
+                scatter_matrix(points, criteria, short_labels, point_scores, counts, is_leader),
+                use_container_width=True,
+            )
+    with tab_parcoords:
+        with profiler.stage("parallel coordinates"):
+            st.plotly_chart(
+                parallel_coordinates(points, criteria, short_labels, point_scores, scores[leaders].min()),
+                use_container_width=True,
+            )
+
+    # --- WEIGHT SENSITIVITY (MONTE CARLO) ---
+    st.markdown("---")
+    st.subheader("Weight Sensitivity Analysis")
+    st.write(
+        "Weight vectors are sampled around the current weights (Dirichlet draws) and the ranking is recomputed "
+        "for each of them, giving the rank distribution of the top 10 aircraft and their probability of staying ahead."
+    )
+
+    col_s1, col_s2, col_s3, col_s4 = st.columns(4)
+    with col_s1:
+        n_samples = st.number_input("Weight samples", min_value=100, max_value=50_000, value=1000, step=100)
+    with col_s2:
+        concentration = st.slider("Concentration (higher = closer to current weights)", min_value=5, max_value=500, value=50)
+    with col_s3:
+        sensitivity_top_n = st.number_input("Top-N for probability", min_value=1, max_value=10, value=3)
+    with col_s4:
+        sensitivity_seed = st.number_input("Random seed", min_value=0, value=0, step=1)
+
+    tracked_alternatives = ranking.top_labels(10)
+    sensitivity_key = (view, tuple(tracked_alternatives), tuple(weights.values()), n_samples, concentration, sensitivity_top_n, sensitivity_seed)
+
+    progress_slot = st.empty()
+    sensitivity_slot = st.empty()
+
+    def show_sensitivity(result):
+        labels = tracked_alternatives
+        with sensitivity_slot.container():
+            fig_prob = go.Figure()
+            fig_prob.add_trace(go.Bar(x=labels, y=result.p_first, name="P(rank #1)", marker_color="#3CB371"))
+            fig_prob.add_trace(go.Bar(x=labels, y=result.p_top_n, name=f"P(top {result.top_n})", marker_color="teal"))
+            fig_prob.update_layout(
+                barmode="group",
+                title=f"Probability of staying ahead ({result.n_samples:,} weight samples)",
+                yaxis=dict(title="Probability", range=[0, 1]),
+                xaxis_title="Aircraft",
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+            )
+            st.plotly_chart(fig_prob, use_container_width=True, key=f"sensitivity_prob_{result.n_samples}")
+
+            rank_labels = [str(r) for r in range(1, result.max_rank + 1)] + [f">{result.max_rank}"]
+            fig_ranks = go.Figure(go.Heatmap(
+                z=result.rank_counts / result.n_samples,
+                x=rank_labels,
+                y=labels,
+                colorscale="Tealgrn",
+                hovertemplate="%{y}<br>Rank %{x}: %{z:.1%}<extra></extra>",
+            ))
+            fig_ranks.update_layout(
+                title="Rank distribution",
+                xaxis_title="Rank",
+                yaxis=dict(autorange="reversed"),
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+            )
+            st.plotly_chart(fig_ranks, use_container_width=True, key=f"sensitivity_ranks_{result.n_samples}")
+
+            winners = pd.DataFrame({
+                "Aircraft": [result_handle.labels[row] for row in result.winners],
+                "P(rank #1)": [count / result.n_samples for count in result.winners.values()],
+            }).sort_values(by="P(rank #1)", ascending=False)
+            summary = pd.DataFrame({
+                "Aircraft": labels,
+                "Mean rank": result.mean_rank,
+                "P(rank #1)": result.p_first,
+                f"P(top {result.top_n})": result.p_top_n,
+            })
+            col_t1, col_t2 = st.columns([3, 2])
+            with col_t1:
+                st.dataframe(summary, use_container_width=True, hide_index=True)
+            with col_t2:
+                st.dataframe(winners, use_container_width=True, hide_index=True)
+
+    if st.button("🎲 Run Sensitivity Analysis"):
+        with profiler.stage("sensitivity"):
+            normalized = result_normalized(result_handle)
+            tracked = ranking.top(10)
+            progress_bar = progress_slot.progress(0.0, text="Sampling weight vectors...")
+            for sensitivity in run_sensitivity(
+                normalized,
+                benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS),
+                [weights[inp] for inp in INPUTS],
+                tracked,
+                n_samples=int(n_samples),
+                concentration=float(concentration),
+                top_n=int(sensitivity_top_n),
+                seed=int(sensitivity_seed),
+            ):
+                progress_bar.progress(sensitivity.n_samples / n_samples, text=f"{sensitivity.n_samples:,} / {int(n_samples):,} weight samples")
+                show_sensitivity(sensitivity)
+        st.session_state['sensitivity'] = (sensitivity_key, sensitivity)
+    elif st.session_state.get('sensitivity', (None,))[0] == sensitivity_key:
+        show_sensitivity(st.session_state['sensitivity'][1])
+
+    # --- TECHNOLOGY UNCERTAINTY (MONTE CARLO) ---
+    st.markdown("---")
+    st.subheader("Technology Uncertainty Analysis")
+    st.write(
+        "Every criterion value is treated as uncertain, with a spread set by the confidence in the technology "
+        "assumptions. Realizations of the whole design space are sampled and re-scored, giving each aircraft's "
+        "expected score, a 90% band and its probability of being in the top N."
+    )
+
+    col_u1, col_u2, col_u3, col_u4 = st.columns(4)
+    with col_u1:
+        n_realizations = st.number_input("Realizations", min_value=100, max_value=20_000, value=1000, step=100)
+    with col_u2:
+        tech_levels = list(TECH_SPREAD_FACTORS)
+        scenario_tech = st.session_state.get('scenario', {}).get("tech_orient", "Nominal")
+        uncertainty_tech = st.selectbox("Technology confidence", tech_levels, index=tech_levels.index(scenario_tech))
+    with col_u3:
+        uncertainty_top_n = st.number_input("Top-N for probability", min_value=1, max_value=50, value=10, key="uncertainty_top_n")
+    with col_u4:
+        uncertainty_seed = st.number_input("Random seed", min_value=0, value=0, step=1, key="uncertainty_seed")
+
+    uncertainty_key = (view, tuple(weights.values()), n_realizations, uncertainty_tech, uncertainty_top_n, uncertainty_seed)
+    uncertainty_progress = st.empty()
+    uncertainty_slot = st.empty()
+
+    def show_uncertainty(result, n_shown=15):
+        # Aircraft most likely to be in the top N, then by expected score
+        rows = np.lexsort((-result.mean, -result.p_top_n))[:n_shown]
+        labels = [result_handle.labels[row] for row in rows]
+        low, high = result.quantile(0.05, rows), result.quantile(0.95, rows)
+        mean = result.mean[rows]
+        with uncertainty_slot.container():
+            fig_bands = go.Figure()
+            fig_bands.add_trace(go.Scatter(
+                x=labels, y=mean, mode="markers", name="Expected score",
+                marker=dict(size=10, color="teal"),
+                error_y=dict(type="data", symmetric=False, array=high - mean, arrayminus=mean - low),
+            ))
+            fig_bands.add_trace(go.Scatter(
+                x=labels, y=result_handle.scores[rows], mode="markers", name="Nominal TOPSIS score",
+                marker=dict(size=8, symbol="diamond-open", color="#3CB371"),
+            ))
+            fig_bands.update_layout(
+                title=f"Expected score and 90% band ({result.n_samples:,} realizations)",
+                yaxis_title="TOPSIS Score",
+                xaxis_title="Aircraft",
+                paper_bgcolor="rgba(0,0,0,0)",
+                plot_bgcolor="rgba(0,0,0,0)",
+            )
+            st.plotly_chart(fig_bands, use_container_width=True, key=f"uncertainty_bands_{result.n_samples}")
+            st.dataframe(pd.DataFrame({
+                "Aircraft": labels,
+                "TOPSIS Rank": [ranking.rank(row) for row in rows],
+                "Expected score": mean,
+                "Std": result.std[rows],
+                "5%": low,
+                "95%": high,
+                f"P(top {result.top_n})": result.p_top_n[rows],
+            }), use_container_width=True, hide_index=True)
+
+    if st.button("🎲 Run Uncertainty Analysis"):
+        with profiler.stage("uncertainty"):
+            progress_bar = uncertainty_progress.progress(0.0, text="Sampling realizations...")
+            for uncertainty in run_uncertainty(
+                result_handle.matrix,
+                [weights[inp] for inp in INPUTS],
+                benefit_mask(OPTIMIZATION, INPUTS_WITH_UNITS),
+                criterion_spread(uncertainty_tech),
+                n_samples=int(n_realizations),
+                top_n=int(uncertainty_top_n),
+                seed=int(uncertainty_seed),
+            ):
+                progress_bar.progress(uncertainty.n_samples / n_realizations, text=f"{uncertainty.n_samples:,} / {int(n_realizations):,} realizations")
+                show_uncertainty(uncertainty)
+        st.session_state['uncertainty'] = (uncertainty_key, uncertainty)
+    elif st.session_state.get('uncertainty', (None,))[0] == uncertainty_key:
+        show_uncertainty(st.session_state['uncertainty'][1])
 
 else:
     st.warning("Please run the analysis on the main page first to display the visualizations.")
 
+diagnostics_panel(profiler)
+
 st.markdown("---")
 
 # --- FOOTER SECTION WITH LOGO ---
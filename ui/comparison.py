@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+
+def format_value(v):
+    """Label of an actual criterion value on the charts."""
+    if isinstance(v, (int, np.integer)):
+        return f"{int(v):,}"
+    if isinstance(v, (float, np.floating)):
+        if abs(v) >= 1000:
+            return f"{v:,.0f}"
+        if abs(v) >= 1:
+            return f"{v:.2f}"
+        return f"{v:.3f}"
+    return str(v)
+
+
+def comparison_table(data, rows, criteria, bounds=None):
+    """Min-max normalized values and value labels of the rows at positions ``rows``.
+
+    The column ranges come from the full ``data``, or from ``bounds``
+    (``(low, high)`` Series by criterion) when ``data`` only holds the rows
+    to compare; only the requested rows are normalized and formatted
+    (positions avoid a label lookup in a large index).
+    Constant columns are set to 0.5.
+    Returns ``(normalized, text)`` DataFrames indexed by label.
+    """
+    values = data[criteria]
+    low, high = bounds if bounds is not None else (values.min(), values.max())
+    span = (high - low).where(high > low)
+
+    selected = values.iloc[list(rows)]
+    normalized = ((selected.astype(float) - low) / span).fillna(0.5)
+    # Column by column, so that integer criteria keep their dtype
+    text = pd.DataFrame({c: [format_value(v) for v in selected[c].to_numpy()] for c in criteria}, index=selected.index)
+    return normalized, text
+
+
+def criteria_bars(selected, criteria, rank_of, n_cols=2):
+    """One bar chart per criterion for the ``selected`` rows, as the subplots of a single figure."""
+    n_rows = math.ceil(len(criteria) / n_cols)
+    fig = make_subplots(
+        rows=n_rows,
+        cols=n_cols,
+        subplot_titles=[f"Comparison for {criterion}" for criterion in criteria],
+        vertical_spacing=0.5 / n_rows,
+    )
+    labels = list(selected.index)
+    rank_text = [f"TOPSIS Rank: {rank_of(label)}" for label in labels]
+    for i, criterion in enumerate(criteria):
+        fig.add_trace(
+            go.Bar(
+                x=labels,
+                y=selected[criterion],
+                text=rank_text,
+                textposition="auto",
+                marker_color="teal",
+                name=criterion,
+                showlegend=False,
+                hovertemplate="%{x}<br>" + criterion + ": %{y}<extra></extra>",
+            ),
+            row=i // n_cols + 1,
+            col=i % n_cols + 1,
+        )
+    fig.update_layout(
+        height=380 * n_rows,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        margin=dict(t=60),
+    )
+    return fig
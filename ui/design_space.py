@@ -0,0 +1,76 @@
+import numpy as np
+import plotly.graph_objects as go
+
+COLORSCALE = "Tealgrn"
+
+
+def _dimensions(points, criteria, labels):
+    return [dict(label=label, values=points[c].to_numpy()) for c, label in zip(criteria, labels)]
+
+
+def scatter_matrix(points, criteria, labels, scores, counts, leaders):
+    """WebGL scatter matrix of the sampled design space, colored by TOPSIS score.
+
+    ``points`` is indexed by aircraft label; ``leaders`` is a boolean mask of
+    the top-N rows, drawn on top with larger markers.
+    """
+    hover = [
+        f"{case}<br>TOPSIS Score: {score:.4f}" + (f"<br>stands for {count:,} alternatives" if count > 1 else "")
+        for case, score, count in zip(points.index, scores, counts)
+    ]
+    fig = go.Figure()
+    for mask, marker, name in [
+        (~leaders, dict(size=3, opacity=0.6), "Design space"),
+        (leaders, dict(size=9, symbol="diamond", line=dict(width=1, color="white")), "Top alternatives"),
+    ]:
+        fig.add_trace(go.Splom(
+            dimensions=_dimensions(points[mask], criteria, labels),
+            text=list(np.asarray(hover, dtype=object)[mask]),
+            hovertemplate="%{text}<extra></extra>",
+            marker=dict(
+                color=scores[mask],
+                colorscale=COLORSCALE,
+                cmin=float(scores.min()),
+                cmax=float(scores.max()),
+                showscale=name == "Design space",
+                colorbar=dict(title="TOPSIS Score"),
+                **marker,
+            ),
+            name=name,
+            diagonal_visible=False,
+            showupperhalf=False,
+        ))
+    fig.update_layout(
+        height=180 * len(criteria),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(size=11),
+        dragmode="select",
+    )
+    return fig
+
+
+def parallel_coordinates(points, criteria, labels, scores, leader_score):
+    """Parallel coordinates of the sampled design space (WebGL lines).
+
+    The TOPSIS Score axis starts brushed to ``[leader_score, max]`` so that
+    the top alternatives stand out; the brush can be dragged in the chart.
+    """
+    dimensions = _dimensions(points, criteria, labels)
+    dimensions.append(dict(
+        label="TOPSIS Score",
+        values=scores,
+        constraintrange=[float(leader_score), float(scores.max())],
+    ))
+    fig = go.Figure(go.Parcoords(
+        line=dict(color=scores, colorscale=COLORSCALE, showscale=True, colorbar=dict(title="TOPSIS Score")),
+        dimensions=dimensions,
+    ))
+    fig.update_layout(
+        height=550,
+        margin=dict(t=80, l=80, r=80),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig
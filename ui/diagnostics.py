@@ -0,0 +1,60 @@
+import json
+from collections import deque
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from mcdm.instrument import Profiler
+
+HISTORY_LENGTH = 50
+
+
+def page_profiler(page_name):
+    """Profiler for this rerun; enabled from the sidebar toggle (shared by all pages)."""
+    enabled = st.sidebar.toggle(
+        "Diagnostics (timing & memory)",
+        value=st.session_state.get("diagnostics_enabled", False),
+        key=f"diagnostics_toggle_{page_name}",
+    )
+    st.session_state["diagnostics_enabled"] = enabled
+    return Profiler(run_name=page_name, enabled=enabled)
+
+
+def diagnostics_panel(profiler):
+    """Store this rerun in the session history and show the collapsible panel."""
+    if not profiler.enabled:
+        return
+    run = profiler.finish()
+    history = st.session_state.setdefault("diagnostics_history", deque(maxlen=HISTORY_LENGTH))
+    if run["stages"]:
+        history.append(run)
+
+    with st.expander("🩺 Diagnostics"):
+        if run["stages"]:
+            stages = pd.DataFrame(run["stages"])
+            stages["ms"] = stages["seconds"] * 1e3
+            stages["peak MiB"] = stages["peak_bytes"] / 2**20
+            stages["net MiB"] = stages["net_bytes"] / 2**20
+            st.markdown(f"**This run** ({run['run']}, {run['total_seconds'] * 1e3:,.1f} ms instrumented)")
+            fig = px.bar(stages, x="ms", y="stage", orientation="h", color="peak MiB",
+                         color_continuous_scale=px.colors.sequential.Tealgrn)
+            fig.update_layout(height=80 + 30 * len(stages), yaxis=dict(autorange="reversed"), yaxis_title=None,
+                              paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
+            st.plotly_chart(fig, use_container_width=True)
+            st.dataframe(stages[["stage", "ms", "peak MiB", "net MiB"]], use_container_width=True, hide_index=True)
+
+        if history:
+            st.markdown(f"**History** (last {len(history)} reruns)")
+            rows = [
+                {"started": r["started"], "page": r["run"], **{s["stage"]: s["seconds"] * 1e3 for s in r["stages"]}}
+                for r in history
+            ]
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+            st.download_button(
+                "Export history (JSON)",
+                data=json.dumps(list(history), indent=2),
+                file_name="diagnostics.json",
+                mime="application/json",
+                key=f"diagnostics_export_{profiler.run_name}",
+            )
@@ -0,0 +1,31 @@
+import streamlit as st
+
+SLIDER_STEPS = 200
+
+
+def requirement_filters(bounds, columns, key="requirements"):
+    """Range sliders on the criteria (``bounds``: their ``(low, high)`` arrays); returns the narrowed ones as ``{column number: (low, high)}``."""
+    requirements = {}
+    with st.expander("🎯 Requirement filters"):
+        st.caption("Hard limits on the criteria: only the aircraft meeting all of them are scored and ranked "
+                   "(and, with the Pareto filter, only their non-dominated ones).")
+        filter_columns = st.columns(3)
+        for j, column in enumerate(columns):
+            low, high = float(bounds[0][j]), float(bounds[1][j])
+            if not high > low:
+                continue
+            with filter_columns[j % 3]:
+                value = st.slider(column, min_value=low, max_value=high, value=(low, high),
+                                  step=(high - low) / SLIDER_STEPS, key=f"{key}_{column}")
+            if value != (low, high):
+                requirements[j] = value
+    return requirements
+
+
+def filter_summary(result, n_rows, columns):
+    """One line: survivors, query time and the rows meeting each requirement alone."""
+    parts = [f"{columns[j]}: {matches / max(n_rows, 1):.1%}" for j, matches in result.matches.items()]
+    st.caption(
+        f"{len(result.rows):,} of {n_rows:,} aircraft meet the requirements "
+        f"(indexed query: {result.seconds * 1e3:.2f} ms). Meeting each one alone: {', '.join(parts)}."
+    )
@@ -0,0 +1,110 @@
+import io
+import uuid
+
+import streamlit as st
+
+from mcdm.jobs import CANCELLED, DONE, FAILED, RUNNER
+from mcdm.loader import convert_design_space, source_name
+from mcdm.pipeline import analyze_scenario
+from mcdm.ranking import Ranking
+from mcdm.store import open_result
+
+POLL_SECONDS = 0.5
+
+
+def _run_analysis(job, scenario, weights, pareto_only, top_n):
+    return analyze_scenario(scenario, weights, pareto_only, top_n, progress=job.progress)
+
+
+def _convert_and_analyze(job, source, column_map, weights, pareto_only, top_n):
+    # First half of the bar for the conversion (skipped once the file is cached)
+    directory = convert_design_space(source, column_map, progress=lambda f, m: job.progress(0.5 * f, m))
+    scenario = {"source": str(directory), "name": source_name(source)}
+    return analyze_scenario(scenario, weights, pareto_only, top_n,
+                            progress=lambda f, m: job.progress(0.5 + 0.5 * f, m))
+
+
+def _holder():
+    """Id of this session as a holder of job results."""
+    if 'job_holder' not in st.session_state:
+        st.session_state['job_holder'] = uuid.uuid4().hex
+    return st.session_state['job_holder']
+
+
+def _follow(job):
+    """Make ``job`` this session's analysis job, releasing the previous one."""
+    previous = analysis_job()
+    if previous is not None and previous is not job:
+        previous.collect(_holder())
+    job.hold(_holder())
+    st.session_state['analysis_job'] = job.id
+    return job
+
+
+def submit_analysis(scenario, weights, pareto_only, top_n):
+    """Start (or join) the background analysis of a scenario for this session."""
+    key = (tuple(scenario.items()), tuple(weights.items()), bool(pareto_only), int(top_n))
+    return _follow(RUNNER.submit(key, _run_analysis, scenario, weights, pareto_only, int(top_n)))
+
+
+def submit_upload(uploaded_file, column_map, weights, pareto_only, top_n):
+    """Convert an uploaded design space and analyze it, both in the background."""
+    # The job reads its own file object: the page seeks the upload on every rerun
+    source = io.BytesIO(uploaded_file.getvalue())
+    source.name = uploaded_file.name
+    key = ("upload", uploaded_file.file_id, tuple(column_map.items()), tuple(weights.items()), bool(pareto_only),
+           int(top_n))
+    return _follow(RUNNER.submit(key, _convert_and_analyze, source, column_map, weights, pareto_only, int(top_n)))
+
+
+def analysis_job():
+    """This session's latest analysis job, if it is still in the registry."""
+    return RUNNER.get(st.session_state.get('analysis_job'))
+
+
+def adopt_finished_analysis():
+    """Publish the result of this session's job once it is done; safe to call on every page.
+
+    The job keeps running when the user switches pages, so whichever page
+    reruns first after it ends stores the result for the others. The job
+    drops its copy of the result once every session has collected it.
+    """
+    job = analysis_job()
+    if job is None or job.status != DONE or st.session_state.get('adopted_job') == job.id:
+        return
+    analysis = job.collect(_holder())
+    if analysis is None:
+        return
+    result = open_result(analysis.dataset_hash, analysis.df, analysis.matrix, analysis.rows, analysis.data_hash)
+    ranking = Ranking(analysis.scores, labels=result.labels, top_n=analysis.ranking.top_n)
+    st.session_state['scenario'] = analysis.scenario
+    st.session_state['result'] = result.set_result(analysis.scores, ranking, analysis.weights)
+    st.session_state['adopted_job'] = job.id
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _job_progress(job_id):
+    # Only this fragment reruns while polling; the whole page reruns once the job ends
+    job = RUNNER.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    col_bar, col_cancel = st.columns([5, 1])
+    with col_bar:
+        text = "Cancelling..." if job.cancel_requested else f"{job.message}... ({job.elapsed:.1f} s)"
+        st.progress(job.fraction, text=text)
+    with col_cancel:
+        if st.button("✖️ Cancel", key=f"cancel_{job_id}", disabled=job.cancel_requested):
+            job.cancel()
+
+
+def job_status():
+    """Progress bar of the running analysis, or how the last one ended."""
+    job = analysis_job()
+    if job is None:
+        return
+    if not job.finished:
+        _job_progress(job.id)
+    elif job.status == FAILED:
+        st.error(f"Analysis failed: {job.message}")
+    elif job.status == CANCELLED:
+        st.info(f"Analysis cancelled after {job.elapsed:.1f} s.")
@@ -0,0 +1,50 @@
+import math
+
+import streamlit as st
+
+from mcdm.browser import RANK_COLUMN
+
+
+def highlight_best_row(row):
+    color = "background-color: #3CB371; color: white" if row[RANK_COLUMN] == 1 else ""
+    return [color] * len(row)
+
+
+def _slider_bounds(browser, column):
+    cast = int if browser.values(column).dtype.kind in "iu" else float
+    return tuple(cast(v) for v in browser.bounds(column))
+
+
+def results_browser(browser, columns, key="results"):
+    """Paginated results table; only the visible page is styled and sent to the browser."""
+    col_sort, col_order, col_size, col_page = st.columns([3, 1, 1, 1])
+    with col_sort:
+        sort_by = st.selectbox("Sort by", [RANK_COLUMN] + list(columns), key=f"{key}_sort")
+    with col_order:
+        ascending = st.toggle("Ascending", value=True, key=f"{key}_ascending")
+    with col_size:
+        page_size = st.selectbox("Rows per page", [10, 25, 50, 100], index=1, key=f"{key}_page_size")
+
+    filters = {}
+    with st.expander("Column filters"):
+        filter_columns = st.columns(3)
+        for i, column in enumerate(columns):
+            low, high = _slider_bounds(browser, column)
+            if low == high:
+                continue
+            with filter_columns[i % 3]:
+                filters[column] = st.slider(column, min_value=low, max_value=high, value=(low, high), key=f"{key}_filter_{column}")
+
+    total = browser.total(sort_by, ascending, filters)
+    n_pages = max(1, math.ceil(total / page_size))
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page")
+
+    window, total = browser.page(int(page) - 1, page_size, sort_by, ascending, filters)
+    first = (int(page) - 1) * page_size + 1 if total else 0
+    st.caption(f"Rows {first:,}–{first + len(window) - 1:,} of {total:,}" + (
+        f" (filtered from {browser.n_rows:,})" if total != browser.n_rows else ""
+    ))
+    st.dataframe(window.style.apply(highlight_best_row, axis=1), use_container_width=True, hide_index=True)